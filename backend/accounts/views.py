@@ -1633,8 +1633,9 @@ class DataExportView(APIView):
             # Trades
             try:
                 from trades.models import ImportedTrade
-                trades = ImportedTrade.objects.filter(user=user)
-                for trade in trades:
+                # Lecture par lots (curseur serveur) : pas de matérialisation de tout l'historique
+                trades = ImportedTrade.objects.filter(user=user).light()
+                for trade in trades.iterator(chunk_size=2000):
                     export_data['trades'].append({
                         'id': trade.id,
                         'external_trade_id': trade.external_trade_id,
@@ -1651,7 +1652,7 @@ class DataExportView(APIView):
                         'commissions': str(trade.commissions) if trade.commissions else None,
                         'trade_day': trade.trade_day.isoformat() if trade.trade_day else None,
                         'trade_duration': str(trade.trade_duration) if trade.trade_duration else None,
-                        'trading_account_id': trade.trading_account.id if trade.trading_account else None,
+                        'trading_account_id': trade.trading_account_id,
                         'imported_at': trade.imported_at.isoformat() if trade.imported_at else None,
                         'updated_at': trade.updated_at.isoformat() if trade.updated_at else None,
                     })
@@ -1667,7 +1668,7 @@ class DataExportView(APIView):
             try:
                 from trades.models import TradeStrategy
                 strategies = TradeStrategy.objects.filter(user=user).select_related('trade')
-                for strategy in strategies:
+                for strategy in strategies.iterator(chunk_size=2000):
                     export_data['strategies'].append({
                         'id': strategy.id,
                         'trade_id': strategy.trade.id if strategy.trade else None,
@@ -17,6 +17,8 @@ class ImportedTradeAdmin(admin.ModelAdmin):
         'duration_display',
         'user'
     ]
+    # Seul user est affiché : évite le select_related() implicite sur toutes les FK non nulles
+    list_select_related = ['user']
     list_filter = [
         'trade_type',
         'contract_name',
@@ -38,7 +40,10 @@ class ImportedTradeAdmin(admin.ModelAdmin):
         'updated_at',
         'formatted_entry_date',
         'formatted_exit_date',
-        'duration_str'
+        'duration_str',
+        'source_import',
+        'source_line_no',
+        'source_row'
     ]
     fieldsets = (
         ('Identification', {
@@ -71,13 +76,18 @@ class ImportedTradeAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
         ('Données Techniques', {
-            'fields': ('raw_data', 'imported_at', 'updated_at'),
+            'fields': ('raw_data', 'source_import', 'source_line_no', 'source_row', 'imported_at', 'updated_at'),
             'classes': ('collapse',)
         }),
     )
     date_hierarchy = 'entered_at'
     ordering = ['-entered_at']
     
+    def source_row(self, obj):
+        # Ligne relue dans le CSV archivé quand raw_data n'a pas été copié (imports CSV)
+        return obj.get_raw_data() or '-'
+    source_row.short_description = 'Ligne source'
+    
     def formatted_entry(self, obj):
         return obj.entered_at.strftime('%d/%m/%Y %H:%M')
     formatted_entry.short_description = 'Entrée'
@@ -148,6 +158,7 @@ class TopStepImportLogAdmin(admin.ModelAdmin):
         'error_count',
         'success_rate_display'
     ]
+    list_select_related = ['user']
     list_filter = [
         'user',
         'imported_at'
@@ -191,6 +202,10 @@ class TopStepImportLogAdmin(admin.ModelAdmin):
         return '-'
     success_rate_display.short_description = 'Taux de réussite'
     
+    def get_queryset(self, request):
+        # csv_content (fichier archivé complet) n'est lu qu'à la demande (get_row)
+        return super().get_queryset(request).defer('csv_content')
+    
     def has_add_permission(self, request):
         return False  # Les logs sont créés automatiquement
     
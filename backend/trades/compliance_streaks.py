@@ -372,7 +372,8 @@ def compute_strategy_compliance_context(
     if month:
         trades_queryset = trades_queryset.filter(trade_day__month=int(month))
 
-    strategies_queryset = TradeStrategy.objects.filter(user=user).select_related("trade")
+    # with_trade : le dashboard sérialise ce queryset (trade_info, user_username)
+    strategies_queryset = TradeStrategy.objects.filter(user=user).with_trade()
     if trading_account_id:
         strategies_queryset = strategies_queryset.filter(
             trade__trading_account_id=trading_account_id
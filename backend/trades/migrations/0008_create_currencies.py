@@ -1,4 +1,4 @@
-from django.db import migrations, models
+from django.db import migrations, models, transaction
 
 
 def seed_currencies(apps, schema_editor):
@@ -23,11 +23,25 @@ def seed_currencies(apps, schema_editor):
     ('INR', 'Roupie indienne', '₹'),
     ('SGD', 'Dollar de Singapour', '$'),
   ]
-  for code, name, symbol in data:
-    Currency.objects.get_or_create(code=code, defaults={'name': name, 'symbol': symbol})
+  existing = set(
+    Currency.objects.filter(code__in=[code for code, _, _ in data]).values_list('code', flat=True)
+  )
+  with transaction.atomic():
+    Currency.objects.bulk_create(
+      [
+        Currency(code=code, name=name, symbol=symbol)
+        for code, name, symbol in data
+        if code not in existing
+      ],
+      ignore_conflicts=True,
+    )
 
 
 class Migration(migrations.Migration):
+  # Seed hors transaction globale : chaque étape garde un petit jeu de verrous
+  # et une reprise après échec partiel reste possible (ignore_conflicts).
+  atomic = False
+
   dependencies = [
     ('trades', '0007_make_trading_account_required'),
   ]
@@ -47,11 +61,13 @@ class Migration(migrations.Migration):
         'verbose_name_plural': 'Devises',
       },
     ),
+    migrations.RunPython(seed_currencies, reverse_code=migrations.RunPython.noop),
+    # Index ajouté après le seed : une seule construction triée au lieu
+    # d'une maintenance à chaque INSERT.
     migrations.AddIndex(
       model_name='currency',
       index=models.Index(fields=['code'], name='trades_curr_code_idx'),
     ),
-    migrations.RunPython(seed_currencies, reverse_code=migrations.RunPython.noop),
   ]
 
 
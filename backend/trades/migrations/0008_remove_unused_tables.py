@@ -3,6 +3,39 @@
 from django.db import migrations
 
 
+# Supprimer les tables inutilisées (7 tables avec 0 enregistrements)
+UNUSED_TABLES = [
+    # Tables socialaccount (OAuth non utilisé)
+    'socialaccount_socialaccount',
+    'socialaccount_socialapp',
+    'socialaccount_socialapp_sites',
+    'socialaccount_socialtoken',
+    # Tables allauth account (non utilisé)
+    'account_emailaddress',
+    'account_emailconfirmation',
+    # ATTENTION: Les tables Guardian ont été supprimées ici mais elles sont nécessaires !
+    # django-guardian est configuré dans settings.py (INSTALLED_APPS et AUTHENTICATION_BACKENDS)
+    # Ces tables sont restaurées dans la migration 0009_restore_guardian_tables.py
+    # 'guardian_groupobjectpermission',
+    # 'guardian_userobjectpermission',
+]
+
+# Syntaxe DROP par moteur : SQLite ne connaît pas CASCADE.
+DROP_TABLE_SQL = {
+    'postgresql': 'DROP TABLE IF EXISTS {table} CASCADE',
+    'mysql': 'DROP TABLE IF EXISTS {table} CASCADE',
+    'sqlite': 'DROP TABLE IF EXISTS {table}',
+}
+
+
+def drop_unused_tables(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    template = DROP_TABLE_SQL.get(vendor, DROP_TABLE_SQL['sqlite'])
+    quote_name = schema_editor.quote_name
+    for table in UNUSED_TABLES:
+        schema_editor.execute(template.format(table=quote_name(table)))
+
+
 class Migration(migrations.Migration):
 
     dependencies = [
@@ -10,25 +43,6 @@ class Migration(migrations.Migration):
     ]
 
     operations = [
-        # Supprimer les tables inutilisées (7 tables avec 0 enregistrements)
-        migrations.RunSQL(
-            sql="""
-            -- Supprimer les tables socialaccount (OAuth non utilisé)
-            DROP TABLE IF EXISTS socialaccount_socialaccount CASCADE;
-            DROP TABLE IF EXISTS socialaccount_socialapp CASCADE;
-            DROP TABLE IF EXISTS socialaccount_socialapp_sites CASCADE;
-            DROP TABLE IF EXISTS socialaccount_socialtoken CASCADE;
-            
-            -- Supprimer les tables allauth account (non utilisé)
-            DROP TABLE IF EXISTS account_emailaddress CASCADE;
-            DROP TABLE IF EXISTS account_emailconfirmation CASCADE;
-            
-            -- ATTENTION: Les tables Guardian ont été supprimées ici mais elles sont nécessaires !
-            -- django-guardian est configuré dans settings.py (INSTALLED_APPS et AUTHENTICATION_BACKENDS)
-            -- Ces tables sont restaurées dans la migration 0009_restore_guardian_tables.py
-            -- DROP TABLE IF EXISTS guardian_groupobjectpermission CASCADE;
-            -- DROP TABLE IF EXISTS guardian_userobjectpermission CASCADE;
-            """,
-            reverse_sql="-- Tables inutilisées supprimées (7 tables)",
-        ),
+        # Tables inutilisées supprimées (7 tables) ; pas de retour arrière
+        migrations.RunPython(drop_unused_tables, reverse_code=migrations.RunPython.noop),
     ]
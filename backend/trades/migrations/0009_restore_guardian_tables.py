@@ -5,7 +5,8 @@
 # entrait en conflit avec guardian.0001_initial sur les bases neuves (tests).
 # La suppression Guardian est désormais commentée dans 0008 ; l’app guardian
 # est la seule source de vérité pour le schéma. Cette migration reste vide
-# pour conserver le graphe (merge 0010).
+# pour conserver le graphe (merge 0010) : aucune opération d'état ni SQL,
+# donc rien à rejouer ni à comparer lors d'un makemigrations.
 
 from django.db import migrations
 
@@ -1,4 +1,4 @@
-from django.db import migrations
+from django.db import migrations, transaction
 
 
 def seed_more_currencies(apps, schema_editor):
@@ -19,8 +19,18 @@ def seed_more_currencies(apps, schema_editor):
     ('IDR', 'Roupie indonésienne', 'Rp'),
     ('PHP', 'Peso philippin', '₱'),
   ]
-  for code, name, symbol in data:
-    Currency.objects.get_or_create(code=code, defaults={'name': name, 'symbol': symbol})
+  existing = set(
+    Currency.objects.filter(code__in=[code for code, _, _ in data]).values_list('code', flat=True)
+  )
+  with transaction.atomic():
+    Currency.objects.bulk_create(
+      [
+        Currency(code=code, name=name, symbol=symbol)
+        for code, name, symbol in data
+        if code not in existing
+      ],
+      ignore_conflicts=True,
+    )
 
 
 class Migration(migrations.Migration):
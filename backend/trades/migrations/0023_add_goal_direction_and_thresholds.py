@@ -1,20 +1,27 @@
 # Generated manually
 
-from django.db import migrations, models
+from django.db import migrations, models, transaction
 import django.db.models.deletion
 
 
 def migrate_target_value_to_threshold_target(apps, schema_editor):
     """Migre target_value vers threshold_target pour les enregistrements existants."""
     TradingGoal = apps.get_model('trades', 'TradingGoal')
-    for goal in TradingGoal.objects.all():
-        if goal.target_value is not None and goal.threshold_target is None:
-            goal.threshold_target = goal.target_value
-            goal.direction = 'minimum'  # Par défaut, les anciens objectifs sont "minimum"
-            goal.save()
+    with transaction.atomic():
+        # Un seul UPDATE : pas de save() par ligne (signaux, UPDATE complet).
+        TradingGoal.objects.filter(
+            target_value__isnull=False,
+            threshold_target__isnull=True,
+        ).update(
+            threshold_target=models.F('target_value'),
+            direction='minimum',  # Par défaut, les anciens objectifs sont "minimum"
+        )
 
 
 class Migration(migrations.Migration):
+    # Pas de transaction globale : la migration de données dispose de sa propre
+    # transaction, les opérations de schéma s'exécutent chacune séparément.
+    atomic = False
 
     dependencies = [
         ('trades', '0022_daystrategycompliance'),
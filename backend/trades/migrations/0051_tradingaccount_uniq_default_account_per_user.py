@@ -0,0 +1,42 @@
+from django.db import migrations, models
+
+
+def demote_duplicate_default_accounts(apps, schema_editor):
+    """Ne conserver qu'un compte par défaut par utilisateur (le plus récemment modifié)."""
+    TradingAccount = apps.get_model('trades', 'TradingAccount')
+    duplicated_users = (
+        TradingAccount.objects.filter(is_default=True)
+        .values('user_id')
+        .annotate(n=models.Count('id'))
+        .filter(n__gt=1)
+        .values_list('user_id', flat=True)
+    )
+    for user_id in duplicated_users:
+        keep_id = (
+            TradingAccount.objects.filter(user_id=user_id, is_default=True)
+            .order_by('-updated_at', '-id')
+            .values_list('id', flat=True)
+            .first()
+        )
+        TradingAccount.objects.filter(user_id=user_id, is_default=True).exclude(id=keep_id).update(
+            is_default=False
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trades', '0050_remove_market_phase_models'),
+    ]
+
+    operations = [
+        migrations.RunPython(demote_duplicate_default_accounts, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='tradingaccount',
+            constraint=models.UniqueConstraint(
+                condition=models.Q(('is_default', True)),
+                fields=('user',),
+                name='uniq_default_account_per_user',
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trades', '0051_tradingaccount_uniq_default_account_per_user'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='importedtrade',
+            name='trades_impo_trade_t_09ad62_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='importedtrade',
+            name='trades_impo_externa_7f0c78_idx',
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trades', '0052_importedtrade_drop_type_and_external_id_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='tradingaccount',
+            name='trades_trad_is_defa_b83d4b_idx',
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trades', '0053_remove_tradingaccount_is_default_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importedtrade',
+            name='source_import',
+            field=models.ForeignKey(blank=True, help_text="Log d'import CSV dont provient le trade", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='trades', to='trades.topstepimportlog', verbose_name='Import source'),
+        ),
+        migrations.AddField(
+            model_name='importedtrade',
+            name='source_line_no',
+            field=models.PositiveIntegerField(blank=True, help_text='Numéro de ligne dans le fichier CSV importé (en-tête = 1)', null=True, verbose_name='Ligne source'),
+        ),
+        migrations.AddField(
+            model_name='topstepimportlog',
+            name='csv_content',
+            field=models.TextField(blank=True, default='', help_text='Fichier CSV importé, archivé pour relire la ligne source des trades', verbose_name='Contenu du fichier'),
+        ),
+    ]
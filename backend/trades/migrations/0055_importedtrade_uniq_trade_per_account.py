@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trades', '0054_importedtrade_source_import'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='importedtrade',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='importedtrade',
+            constraint=models.UniqueConstraint(fields=('trading_account', 'external_trade_id'), name='uniq_trade_per_account'),
+        ),
+    ]
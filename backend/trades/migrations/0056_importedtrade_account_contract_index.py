@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trades', '0055_importedtrade_uniq_trade_per_account'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='importedtrade',
+            name='trades_impo_contrac_bc443e_idx',
+        ),
+        migrations.AlterField(
+            model_name='importedtrade',
+            name='contract_name',
+            field=models.CharField(help_text='Symbole du contrat (ex: NQZ5, ESH5, YMH5)', max_length=50, verbose_name='Nom du contrat'),
+        ),
+        migrations.AlterField(
+            model_name='importedtrade',
+            name='trade_type',
+            field=models.CharField(choices=[('Long', 'Long'), ('Short', 'Short')], max_length=10, verbose_name='Type de trade'),
+        ),
+        migrations.AddIndex(
+            model_name='importedtrade',
+            index=models.Index(fields=['trading_account', 'contract_name', '-entered_at'], name='idx_trade_acct_contract'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:49
+
+from django.db import migrations, models
+
+
+# Contrainte → condition des lignes qui la violeraient
+_INVALID_CONDITIONS = {
+    'ck_trade_entry_price_pos': {'entry_price__lte': 0},
+    'ck_trade_size_pos': {'size__lte': 0},
+    'ck_trade_point_value_pos': {'point_value__lte': 0},
+    'ck_trade_planned_stop_loss_pos': {'planned_stop_loss__lte': 0},
+    'ck_trade_planned_take_profit_pos': {'planned_take_profit__lte': 0},
+}
+
+
+def check_no_invalid_trades(apps, schema_editor):
+    """
+    Refuse d'appliquer les CHECK tant que des trades les violent : aucune donnée n'est
+    modifiée ni supprimée ici. Le message liste, par contrainte, le nombre de lignes et
+    leurs ids pour que l'opérateur corrige les données avant de relancer la migration.
+    """
+    ImportedTrade = apps.get_model('trades', 'ImportedTrade')
+    problems = []
+    for constraint, condition in _INVALID_CONDITIONS.items():
+        ids = list(ImportedTrade.objects.filter(**condition).order_by('pk').values_list('pk', flat=True))
+        if ids:
+            problems.append(f"{constraint}: {len(ids)} trade(s), ids {ids}")
+    if problems:
+        raise RuntimeError(
+            'Trades incompatibles avec les contraintes CHECK, à corriger avant la migration :\n'
+            + '\n'.join(problems)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trades', '0056_importedtrade_account_contract_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_no_invalid_trades, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='importedtrade',
+            constraint=models.CheckConstraint(check=models.Q(('entry_price__gt', 0)), name='ck_trade_entry_price_pos'),
+        ),
+        migrations.AddConstraint(
+            model_name='importedtrade',
+            constraint=models.CheckConstraint(check=models.Q(('size__gt', 0)), name='ck_trade_size_pos'),
+        ),
+        migrations.AddConstraint(
+            model_name='importedtrade',
+            constraint=models.CheckConstraint(check=models.Q(('point_value__isnull', True), ('point_value__gt', 0), _connector='OR'), name='ck_trade_point_value_pos'),
+        ),
+        migrations.AddConstraint(
+            model_name='importedtrade',
+            constraint=models.CheckConstraint(check=models.Q(('planned_stop_loss__isnull', True), ('planned_stop_loss__gt', 0), _connector='OR'), name='ck_trade_planned_stop_loss_pos'),
+        ),
+        migrations.AddConstraint(
+            model_name='importedtrade',
+            constraint=models.CheckConstraint(check=models.Q(('planned_take_profit__isnull', True), ('planned_take_profit__gt', 0), _connector='OR'), name='ck_trade_planned_take_profit_pos'),
+        ),
+    ]
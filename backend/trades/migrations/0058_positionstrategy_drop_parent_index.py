@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 01:56
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trades', '0057_importedtrade_positive_checks'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='positionstrategy',
+            name='trades_posi_parent__88937f_idx',
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trades', '0058_positionstrategy_drop_parent_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tradinggoal',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['user', '-priority', '-created_at'], name='tg_user_prio_created_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:05
+
+from django.db import migrations, models
+import django.db.models.functions.comparison
+
+
+def keep_latest_current_version(apps, schema_editor):
+    """Groupes avec plusieurs versions actuelles : seule la version la plus haute le reste."""
+    PositionStrategy = apps.get_model('trades', 'PositionStrategy')
+    group_key = django.db.models.functions.comparison.Coalesce('parent_strategy', 'id')
+    duplicated = (
+        PositionStrategy.objects.filter(is_current=True)
+        .annotate(group_id=group_key)
+        .values('group_id')
+        .annotate(n=models.Count('id'))
+        .filter(n__gt=1)
+        .values_list('group_id', flat=True)
+    )
+    for group_id in list(duplicated):
+        current = PositionStrategy.objects.filter(
+            models.Q(id=group_id) | models.Q(parent_strategy_id=group_id), is_current=True
+        ).order_by('-version', '-id')
+        keep_id = current.values_list('id', flat=True).first()
+        current.exclude(id=keep_id).update(is_current=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trades', '0059_tradinggoal_active_priority_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_latest_current_version, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='positionstrategy',
+            constraint=models.UniqueConstraint(django.db.models.functions.comparison.Coalesce('parent_strategy', 'id'), condition=models.Q(('is_current', True)), name='one_current_per_strategy'),
+        ),
+    ]
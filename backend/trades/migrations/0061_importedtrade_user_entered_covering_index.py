@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trades', '0060_positionstrategy_one_current'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='importedtrade',
+            index=models.Index(fields=['user', '-entered_at'], include=('contract_name', 'trade_type', 'net_pnl', 'pnl'), name='idx_trade_user_entered_cov'),
+        ),
+        # Après la création : la requête garde un index (user, -entered_at) à tout instant
+        migrations.RemoveIndex(
+            model_name='importedtrade',
+            name='trades_impo_user_id_1d0d9a_idx',
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trades', '0061_importedtrade_user_entered_covering_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='importedtrade',
+            name='trades_impo_trade_d_162569_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tradestrategy',
+            name='trades_trad_trade_i_ef31dc_idx',
+        ),
+        migrations.AlterField(
+            model_name='tradestrategy',
+            name='trade',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='strategy_data', to='trades.importedtrade', verbose_name='Trade associé'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:33
+
+from django.db import migrations, models
+
+
+def keep_latest_default_template(apps, schema_editor):
+    """Plusieurs templates par défaut pour un même (user, format) : seul le plus récent le reste."""
+    ExportTemplate = apps.get_model('trades', 'ExportTemplate')
+    duplicated = (
+        ExportTemplate.objects.filter(is_default=True)
+        .values('user_id', 'format')
+        .annotate(n=models.Count('id'))
+        .filter(n__gt=1)
+        .values_list('user_id', 'format')
+    )
+    for user_id, fmt in list(duplicated):
+        defaults = ExportTemplate.objects.filter(
+            user_id=user_id, format=fmt, is_default=True
+        ).order_by('-updated_at', '-id')
+        keep_id = defaults.values_list('id', flat=True).first()
+        defaults.exclude(id=keep_id).update(is_default=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trades', '0062_drop_redundant_trade_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_latest_default_template, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='exporttemplate',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_default', True)), fields=('user', 'format'), name='uniq_default_export_template'),
+        ),
+        # L'index partiel de la contrainte sert la recherche du template par défaut
+        migrations.RemoveIndex(
+            model_name='exporttemplate',
+            name='trades_expo_user_id_c488b7_idx',
+        ),
+    ]
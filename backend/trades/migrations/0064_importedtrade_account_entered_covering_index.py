@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trades', '0063_exporttemplate_one_default_per_format'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='importedtrade',
+            index=models.Index(fields=['trading_account', '-entered_at'], include=('contract_name', 'trade_type', 'pnl', 'net_pnl', 'size'), name='idx_trade_acct_entered_cov'),
+        ),
+        # Après la création : la requête garde un index (trading_account, -entered_at) à tout instant
+        migrations.RemoveIndex(
+            model_name='importedtrade',
+            name='trades_impo_trading_d80341_idx',
+        ),
+    ]
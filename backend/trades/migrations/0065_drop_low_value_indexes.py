@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:35
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trades', '0064_importedtrade_account_entered_covering_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='accountdailymetrics',
+            name='trades_acco_trading_121a4a_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='accountdailymetrics',
+            name='trades_acco_date_6a190c_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='accounttransaction',
+            name='trades_acco_transac_ad6bbb_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='currency',
+            name='trades_curr_code_5c8100_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='importedtrade',
+            name='trades_impo_positio_50033e_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tradingaccount',
+            name='trades_trad_account_c293cb_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tradinggoal',
+            name='trades_trad_trading_a1c7aa_idx',
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trades', '0065_drop_low_value_indexes'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='accounttransaction',
+            constraint=models.CheckConstraint(check=models.Q(('amount__gt', 0)), name='ck_transaction_amount_pos'),
+        ),
+    ]
@@ -1,15 +1,39 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.core.validators import MinValueValidator
+from django.db.models.functions import Cast, Coalesce, Least
 from decimal import Decimal
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
+from functools import cached_property, lru_cache
 from typing import Any
-import pytz
+import csv
+import io
+import re
 
 # Constantes pour les valeurs par défaut des BooleanField
 _MLL_ENABLED_DEFAULT: Any = True
 _MLL_IS_LOCKED_DEFAULT: Any = False
 
+# Constantes décimales réutilisées par les calculs de save() (évite une allocation par appel)
+_DEC_ZERO = Decimal('0')
+_DEC_HUNDRED = Decimal('100')
+
+# Parsing des dates TopStep (appelé pour chaque ligne des imports CSV)
+_UTC = dt_timezone.utc
+_US_DATETIME_FORMAT = '%m/%d/%Y %H:%M:%S'
+_DURATION_RE = re.compile(r'^(\d+):(\d+):(\d+)(?:\.(\d+))?$')
+# 'MM/DD/YYYY HH:MM:SS ±HH:MM' réécrit en ISO 8601 pour datetime.fromisoformat (parseur C)
+_US_DATETIME_RE = re.compile(r'^(\d{2})/(\d{2})/(\d{4}) (\d{2}:\d{2}:\d{2}) ([+-]\d{2}:\d{2})$')
+
+
+@lru_cache(maxsize=64)
+def _fixed_offset_tz(tz_part):
+    """Fuseau à décalage fixe pour un suffixe '+HH:MM' / '-HH:MM' (mis en cache)."""
+    offset = timedelta(hours=int(tz_part[1:3]), minutes=int(tz_part[4:6]))
+    if tz_part[0] == '-':
+        offset = -offset
+    return dt_timezone(offset)
+
 
 class Currency(models.Model):
     """Table des devises courantes."""
@@ -21,9 +45,6 @@ class Currency(models.Model):
         ordering = ['code']
         verbose_name = 'Devise'
         verbose_name_plural = 'Devises'
-        indexes = [
-            models.Index(fields=['code']),
-        ]
 
     def __str__(self):
         return f"{self.code} ({self.symbol})"
@@ -42,6 +63,8 @@ class TradingAccount(models.Model):
         ('tradovate', 'Tradovate'),
         ('other', 'Autre'),
     ]
+    # Libellés indexés une fois pour __str__ (listes admin)
+    ACCOUNT_TYPE_LABELS = dict(ACCOUNT_TYPE_CHOICES)
     
     STATUS_CHOICES = [
         ('active', 'Actif'),
@@ -256,26 +279,55 @@ class TradingAccount(models.Model):
         unique_together = ['user', 'name']
         indexes = [
             models.Index(fields=['user', 'status']),
-            models.Index(fields=['account_type']),
-            models.Index(fields=['is_default']),
+            # Pas d'index sur account_type / is_default seuls (peu de valeurs distinctes). La recherche
+            # du compte par défaut (user, is_default=True) utilise l'index partiel de uniq_default_account_per_user.
             models.Index(
                 fields=['copy_imports_from'],
                 name='trades_trad_copy_im_7f3a1b_idx',
             ),
         ]
+        constraints = [
+            # Au plus un compte par défaut par utilisateur
+            models.UniqueConstraint(
+                fields=['user'],
+                condition=models.Q(is_default=True),
+                name='uniq_default_account_per_user',
+            ),
+        ]
     
     def __str__(self):
-        return f"{self.name} ({self.get_account_type_display()})"  # type: ignore
+        return f"{self.name} ({self.display_type})"
     
     def save(self, *args, **kwargs):
-        # S'assurer qu'un seul compte est marqué comme défaut par utilisateur
-        if self.is_default:
+        # S'assurer qu'un seul compte est marqué comme défaut par utilisateur. UPDATE filtré
+        # sans relecture : aucune ligne touchée quand aucun autre compte n'est le défaut, et
+        # une instance périmée (défaut changé entre-temps) rétrograde bien le nouveau défaut.
+        update_fields = kwargs.get('update_fields')
+        if self.is_default and (update_fields is None or 'is_default' in update_fields):
             TradingAccount.objects.filter(  # type: ignore
-                user=self.user, 
+                user_id=self.user_id,  # type: ignore
                 is_default=True
             ).exclude(pk=self.pk).update(is_default=False)
         super().save(*args, **kwargs)
     
+    @classmethod
+    def bulk_set_default(cls, user, account_id):
+        """
+        Définit account_id comme compte par défaut de user en deux UPDATE, quel que soit
+        le nombre de comptes. Les comptes de l'utilisateur sont verrouillés d'abord pour
+        sérialiser les changements concurrents ; la rétrogradation précède la promotion
+        car l'index unique partiel est vérifié ligne par ligne.
+        """
+        with transaction.atomic():
+            list(cls.objects.select_for_update().filter(user=user).values_list('pk', flat=True))  # type: ignore
+            cls.objects.filter(user=user, is_default=True).exclude(pk=account_id).update(is_default=False)  # type: ignore
+            cls.objects.filter(user=user, pk=account_id).update(is_default=True)  # type: ignore
+    
+    @property
+    def display_type(self):
+        """Libellé du type de compte (sans passer par get_account_type_display)."""
+        return self.ACCOUNT_TYPE_LABELS.get(self.account_type, self.account_type)
+    
     @property
     def is_topstep(self):
         """Vérifie si c'est un compte TopStep"""
@@ -299,6 +351,14 @@ class TradingAccount(models.Model):
         return self.maximum_loss_limit
 
 
+class AccountTransactionQuerySet(models.QuerySet):
+    """QuerySet des transactions de compte."""
+
+    def with_account(self):
+        """Charge le compte de trading en jointure (évite un SELECT par ligne)."""
+        return self.select_related('trading_account')
+
+
 class AccountTransaction(models.Model):
     """
     Modèle pour gérer les transactions de compte (dépôts et retraits).
@@ -367,14 +427,20 @@ class AccountTransaction(models.Model):
         verbose_name='Modifié le'
     )
     
+    objects = AccountTransactionQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-transaction_date', '-created_at']
         verbose_name = 'Transaction de compte'
         verbose_name_plural = 'Transactions de compte'
+        constraints = [
+            # Même borne que le MinValueValidator, appliquée aussi aux update() / bulk_create
+            models.CheckConstraint(check=models.Q(amount__gt=0), name='ck_transaction_amount_pos'),
+        ]
         indexes = [
             models.Index(fields=['user', '-transaction_date']),
             models.Index(fields=['trading_account', '-transaction_date']),
-            models.Index(fields=['transaction_type']),
+            # Pas d'index sur transaction_type (dépôt / retrait) : toujours filtré après user ou compte
         ]
     
     def __str__(self):
@@ -385,7 +451,7 @@ class AccountTransaction(models.Model):
     def signed_amount(self):
         """Retourne le montant avec le signe approprié (positif pour dépôt, négatif pour retrait)."""
         # Convertir en Decimal pour les opérations
-        amount_decimal = Decimal(str(self.amount)) if self.amount is not None else Decimal('0')
+        amount_decimal = Decimal(str(self.amount)) if self.amount is not None else _DEC_ZERO
         if self.transaction_type == 'deposit':
             return amount_decimal
         else:  # withdrawal
@@ -459,16 +525,53 @@ class AccountDailyMetrics(models.Model):
         ordering = ['-date']
         verbose_name = 'Métrique quotidienne de compte'
         verbose_name_plural = 'Métriques quotidiennes de compte'
+        # L'index unique (trading_account, date) sert aussi les parcours par date décroissante ;
+        # date seule est indexée par db_index=True
         unique_together = ['trading_account', 'date']
-        indexes = [
-            models.Index(fields=['trading_account', '-date']),
-            models.Index(fields=['date']),
-        ]
     
     def __str__(self):
         return f"{self.trading_account.name} - {self.date} - MLL: {self.maximum_loss_limit}"
 
 
+class EuropeanDateTime(models.Func):
+    """Formate un datetime en DD/MM/YYYY HH:MM:SS côté base (fuseau de connexion : UTC)."""
+
+    output_field = models.CharField(max_length=19)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template="to_char(%(expressions)s, 'DD/MM/YYYY HH24:MI:SS')",
+            **extra_context,
+        )
+
+    def as_sql(self, compiler, connection, **extra_context):
+        extra_context.setdefault('template', "strftime('%%%%d/%%%%m/%%%%Y %%%%H:%%%%M:%%%%S', %(expressions)s)")
+        return super().as_sql(compiler, connection, **extra_context)
+
+
+class ImportedTradeQuerySet(models.QuerySet):
+    """QuerySet des trades importés."""
+
+    def with_related(self):
+        """Jointures standard des listes de trades (compte, stratégie de position, utilisateur)."""
+        return self.select_related('trading_account', 'position_strategy', 'user')
+
+    def light(self):
+        """Diffère les colonnes lourdes inutiles aux listes (JSON brut, textes libres)."""
+        return self.defer('raw_data', 'notes', 'strategy')
+
+    def with_formatted_dates(self):
+        """
+        Calcule formatted_entry_date / formatted_exit_date en SQL : l'annotation remplit
+        directement les cached_property du modèle (pas de strftime Python par ligne).
+        """
+        return self.annotate(
+            formatted_entry_date=EuropeanDateTime('entered_at'),
+            formatted_exit_date=EuropeanDateTime('exited_at'),
+        )
+
+
 class ImportedTrade(models.Model):
     """
     Trade importé depuis un export broker (CSV) ou une sync API, ou créé manuellement.
@@ -500,7 +603,7 @@ class ImportedTrade(models.Model):
         help_text='Compte de trading associé à ce trade'
     )
     
-    # ID externe broker — unicité par (user, trading_account, external_trade_id), pas globalement
+    # ID externe broker — unicité par (trading_account, external_trade_id), pas globalement
     external_trade_id = models.CharField(
         max_length=50,
         verbose_name='ID trade broker',
@@ -511,8 +614,7 @@ class ImportedTrade(models.Model):
     contract_name = models.CharField(
         max_length=50,
         verbose_name='Nom du contrat',
-        help_text='Symbole du contrat (ex: NQZ5, ESH5, YMH5)',
-        db_index=True
+        help_text='Symbole du contrat (ex: NQZ5, ESH5, YMH5)'
     )
     
     # EnteredAt (format US: 10/08/2025 18:23:28 +02:00)
@@ -591,8 +693,7 @@ class ImportedTrade(models.Model):
     trade_type = models.CharField(
         max_length=10,
         choices=TRADE_TYPE_CHOICES,
-        verbose_name='Type de trade',
-        db_index=True
+        verbose_name='Type de trade'
     )
     
     # TradeDay (format US: 10/08/2025 00:00:00 -05:00)
@@ -640,13 +741,29 @@ class ImportedTrade(models.Model):
         help_text='Pourcentage de profit/perte'
     )
     
-    # Données brutes pour référence
+    # Données brutes pour référence (trades API : fills broker utilisés par le replay)
     raw_data = models.JSONField(
         null=True,
         blank=True,
         verbose_name='Données brutes',
         help_text='Données originales au format JSON pour référence'
     )
+    # Import CSV : référence vers la ligne du fichier archivé plutôt qu'une copie JSON
+    source_import = models.ForeignKey(
+        'TopStepImportLog',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='trades',
+        verbose_name='Import source',
+        help_text='Log d\'import CSV dont provient le trade'
+    )
+    source_line_no = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Ligne source',
+        help_text='Numéro de ligne dans le fichier CSV importé (en-tête = 1)'
+    )
     
     # Notes et stratégie
     notes = models.TextField(
@@ -728,90 +845,153 @@ class ImportedTrade(models.Model):
         ordering = ['-entered_at']
         verbose_name = 'Trade importé'
         verbose_name_plural = 'Trades importés'
-        unique_together = ['user', 'trading_account', 'external_trade_id']
+        constraints = [
+            # Le compte implique l'utilisateur : (compte, id broker) suffit et sert l'anti-doublon des imports
+            models.UniqueConstraint(
+                fields=['trading_account', 'external_trade_id'],
+                name='uniq_trade_per_account',
+            ),
+            # Mêmes bornes que les MinValueValidator, appliquées aussi aux chemins sans
+            # validation Python (bulk_create des imports, update())
+            models.CheckConstraint(check=models.Q(entry_price__gt=0), name='ck_trade_entry_price_pos'),
+            models.CheckConstraint(check=models.Q(size__gt=0), name='ck_trade_size_pos'),
+            models.CheckConstraint(
+                check=models.Q(point_value__isnull=True) | models.Q(point_value__gt=0),
+                name='ck_trade_point_value_pos',
+            ),
+            models.CheckConstraint(
+                check=models.Q(planned_stop_loss__isnull=True) | models.Q(planned_stop_loss__gt=0),
+                name='ck_trade_planned_stop_loss_pos',
+            ),
+            models.CheckConstraint(
+                check=models.Q(planned_take_profit__isnull=True) | models.Q(planned_take_profit__gt=0),
+                name='ck_trade_planned_take_profit_pos',
+            ),
+        ]
         indexes = [
-            models.Index(fields=['user', '-entered_at']),
-            models.Index(fields=['trading_account', '-entered_at']),
-            models.Index(fields=['contract_name']),
-            models.Index(fields=['trade_type']),
-            models.Index(fields=['trade_day']),
-            models.Index(fields=['external_trade_id']),
+            # Historique d'un utilisateur (tous comptes, tri par défaut -entered_at) : INCLUDE permet
+            # un index-only scan pour les lectures (contrat, sens, PnL) ; remplace l'index (user, -entered_at)
+            models.Index(
+                fields=['user', '-entered_at'],
+                include=['contract_name', 'trade_type', 'net_pnl', 'pnl'],
+                name='idx_trade_user_entered_cov',
+            ),
+            # Listes paginées d'un compte, filtrées ou non par user (le compte implique l'utilisateur) :
+            # idem avec la taille ; remplace l'index (trading_account, -entered_at)
+            models.Index(
+                fields=['trading_account', '-entered_at'],
+                include=['contract_name', 'trade_type', 'pnl', 'net_pnl', 'size'],
+                name='idx_trade_acct_entered_cov',
+            ),
+            # Liste par symbole d'un compte
+            models.Index(fields=['trading_account', 'contract_name', '-entered_at'], name='idx_trade_acct_contract'),
+            # trade_day seul : déjà indexé par db_index=True sur le champ
             # Optimisation StrategiesPage : filtres par user + trade_day
             models.Index(fields=['user', 'trade_day']),
             # Optimisation StrategiesPage : filtres par user + compte + trade_day
             models.Index(fields=['user', 'trading_account', 'trade_day']),
             # Optimisation filtre Position Strategy : utilisé sur Dashboard, Analytics, Statistics, Strategies, Trades
-            models.Index(fields=['position_strategy']),
+            # (position_strategy seul : index implicite de la ForeignKey)
             models.Index(fields=['user', 'position_strategy']),
         ]
     
+    objects = ImportedTradeQuerySet.as_manager()
+    
+    # Propriétés d'affichage mises en cache par instance (listes / sérialisation)
+    _FORMATTED_PROPERTIES = (
+        'duration_str', 'formatted_entry_date', 'formatted_exit_date',
+        'formatted_entry_price', 'formatted_exit_price', 'formatted_pnl',
+    )
+    
     def __str__(self):
         return f"{self.contract_name} - {self.trade_type} - {self.entered_at.strftime('%d/%m/%Y %H:%M')}"  # type: ignore
     
+    def _clear_formatted_cache(self):
+        """Invalide les cached_property d'affichage (recalculées au prochain accès)."""
+        for name in self._FORMATTED_PROPERTIES:
+            self.__dict__.pop(name, None)
+    
+    def refresh_from_db(self, *args, **kwargs):
+        self._clear_formatted_cache()
+        super().refresh_from_db(*args, **kwargs)
+    
     def save(self, *args, **kwargs):
         """
         Calcule automatiquement le PnL, la durée, le PnL net, le pourcentage et les R:R avant sauvegarde.
         """
+        self._clear_formatted_cache()
+        
+        # Avec update_fields (ex: notes seules), ne recalculer que les champs dérivés
+        # effectivement sauvegardés : les autres ne seraient pas écrits en base.
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = kwargs['update_fields'] = frozenset(update_fields)
+        
+        def needs(*fields):
+            return update_fields is None or not update_fields.isdisjoint(fields)
+        
         # Calculer la durée si entered_at et exited_at sont présents
-        if self.entered_at and self.exited_at:
+        if needs('trade_duration') and self.entered_at and self.exited_at:
             self.trade_duration = self.exited_at - self.entered_at  # type: ignore
         
         # Calculer le trade_day à partir de entered_at (recalculer à chaque fois pour gérer les modifications)
-        if self.entered_at:
+        if needs('trade_day') and self.entered_at:
             self.trade_day = self.entered_at.date()  # type: ignore
         
         # Calculer le R:R prévu si stop loss et take profit sont fournis
-        if (self.entry_price and self.planned_stop_loss and self.planned_take_profit and self.trade_type):
-            risk = Decimal('0')
-            reward = Decimal('0')
+        if needs('planned_risk_reward_ratio'):
+            if (self.entry_price and self.planned_stop_loss and self.planned_take_profit and self.trade_type):
+                risk = _DEC_ZERO
+                reward = _DEC_ZERO
             
-            if self.trade_type == 'Long':
-                # Long: risk = entry - stop_loss, reward = take_profit - entry
-                risk = self.entry_price - self.planned_stop_loss  # type: ignore
-                reward = self.planned_take_profit - self.entry_price  # type: ignore
-            else:  # Short
-                # Short: risk = stop_loss - entry, reward = entry - take_profit
-                risk = self.planned_stop_loss - self.entry_price  # type: ignore
-                reward = self.entry_price - self.planned_take_profit  # type: ignore
+                if self.trade_type == 'Long':
+                    # Long: risk = entry - stop_loss, reward = take_profit - entry
+                    risk = self.entry_price - self.planned_stop_loss  # type: ignore
+                    reward = self.planned_take_profit - self.entry_price  # type: ignore
+                else:  # Short
+                    # Short: risk = stop_loss - entry, reward = entry - take_profit
+                    risk = self.planned_stop_loss - self.entry_price  # type: ignore
+                    reward = self.entry_price - self.planned_take_profit  # type: ignore
             
-            if risk > 0:
-                # Utiliser la valeur absolue du reward pour être cohérent avec le R:R réel
-                # et éviter les R:R prévus négatifs qui peuvent survenir avec des TP mal configurés
-                self.planned_risk_reward_ratio = abs(reward) / risk  # type: ignore
-            else:
+                if risk > 0:
+                    # Utiliser la valeur absolue du reward pour être cohérent avec le R:R réel
+                    # et éviter les R:R prévus négatifs qui peuvent survenir avec des TP mal configurés
+                    self.planned_risk_reward_ratio = abs(reward) / risk  # type: ignore
+                else:
+                    self.planned_risk_reward_ratio = None  # type: ignore
+            elif not (self.planned_stop_loss and self.planned_take_profit):
+                # Si stop loss ou take profit manquent, R:R prévu = None
                 self.planned_risk_reward_ratio = None  # type: ignore
-        elif not (self.planned_stop_loss and self.planned_take_profit):
-            # Si stop loss ou take profit manquent, R:R prévu = None
-            self.planned_risk_reward_ratio = None  # type: ignore
         
         # Calculer le R:R réel si exit_price est fourni
-        if (self.entry_price and self.exit_price and self.planned_stop_loss and self.trade_type):
-            risk = Decimal('0')
-            reward = Decimal('0')
+        if needs('actual_risk_reward_ratio'):
+            if (self.entry_price and self.exit_price and self.planned_stop_loss and self.trade_type):
+                risk = _DEC_ZERO
+                reward = _DEC_ZERO
             
-            if self.trade_type == 'Long':
-                # Long: risk = entry - stop_loss, reward = exit - entry
-                risk = self.entry_price - self.planned_stop_loss  # type: ignore
-                reward = self.exit_price - self.entry_price  # type: ignore
-            else:  # Short
-                # Short: risk = stop_loss - entry, reward = entry - exit
-                risk = self.planned_stop_loss - self.entry_price  # type: ignore
-                reward = self.entry_price - self.exit_price  # type: ignore
+                if self.trade_type == 'Long':
+                    # Long: risk = entry - stop_loss, reward = exit - entry
+                    risk = self.entry_price - self.planned_stop_loss  # type: ignore
+                    reward = self.exit_price - self.entry_price  # type: ignore
+                else:  # Short
+                    # Short: risk = stop_loss - entry, reward = entry - exit
+                    risk = self.planned_stop_loss - self.entry_price  # type: ignore
+                    reward = self.entry_price - self.exit_price  # type: ignore
             
-            if risk > 0:
-                # Utiliser la valeur absolue du reward pour éviter les R:R négatifs
-                # qui faussent les statistiques. Le R:R représente toujours le ratio
-                # entre le montant gagné/perdu et le risque, donc il doit être positif.
-                self.actual_risk_reward_ratio = abs(reward) / risk  # type: ignore
+                if risk > 0:
+                    # Utiliser la valeur absolue du reward pour éviter les R:R négatifs
+                    # qui faussent les statistiques. Le R:R représente toujours le ratio
+                    # entre le montant gagné/perdu et le risque, donc il doit être positif.
+                    self.actual_risk_reward_ratio = abs(reward) / risk  # type: ignore
+                else:
+                    self.actual_risk_reward_ratio = None  # type: ignore
             else:
+                # Si exit_price ou stop_loss manquent, R:R réel = None
                 self.actual_risk_reward_ratio = None  # type: ignore
-        else:
-            # Si exit_price ou stop_loss manquent, R:R réel = None
-            self.actual_risk_reward_ratio = None  # type: ignore
         
         # Calculer automatiquement le PnL brut uniquement s'il n'est pas déjà défini
         # (import CSV TopStep, création via formulaire : le brut est dérivé des prix, point_value et taille)
-        if self.pnl is None and self.entry_price and self.exit_price and self.size and self.trade_type:
+        if needs('pnl') and self.pnl is None and self.entry_price and self.exit_price and self.size and self.trade_type:
             if self.trade_type == 'Long':
                 # Long: gain si prix monte
                 price_diff = self.exit_price - self.entry_price  # type: ignore
@@ -828,23 +1008,114 @@ class ImportedTrade(models.Model):
                 self.pnl = price_diff * self.size  # type: ignore
         
         # Calculer le PnL net
-        if self.pnl is not None:
+        if needs('net_pnl', 'pnl_percentage') and self.pnl is not None:
             self.net_pnl = self.pnl - self.fees - self.commissions  # type: ignore
             
             # Calculer le pourcentage de PnL
             if self.entry_price and self.size:
                 investment = self.entry_price * self.size  # type: ignore
                 if investment > 0:
-                    self.pnl_percentage = (self.net_pnl / investment) * Decimal('100')
+                    self.pnl_percentage = (self.net_pnl / investment) * _DEC_HUNDRED  # type: ignore
         
         super().save(*args, **kwargs)
-    
+
+    @classmethod
+    def bulk_compute(cls, df):
+        """
+        Version vectorisée (pandas) des calculs de save() pour les imports en masse.
+
+        Colonnes attendues : entered_at, exited_at, entry_price, exit_price, size,
+        point_value, fees, commissions, trade_type ; optionnelles : pnl,
+        planned_stop_loss, planned_take_profit, trade_duration.
+        Les colonnes décimales restent des Decimal (dtype object) pour obtenir
+        exactement les mêmes valeurs que save(). Retourne une copie complétée de
+        trade_duration, trade_day, pnl, net_pnl, pnl_percentage et des R:R.
+        """
+        df = df.astype(object)
+        for col in ('pnl', 'planned_stop_loss', 'planned_take_profit', 'trade_duration'):
+            if col not in df.columns:
+                df[col] = None
+        df = df.where(df.notna(), None)
+        # point_value peut venir des specs contrat en float (ex: 12.5)
+        df['point_value'] = df['point_value'].map(
+            lambda v: Decimal(str(v)) if v is not None and not isinstance(v, Decimal) else v
+        )
+        for col in ('fees', 'commissions'):
+            df[col] = df[col].map(lambda v: _DEC_ZERO if v is None else v)
+        for col in ('net_pnl', 'pnl_percentage', 'planned_risk_reward_ratio', 'actual_risk_reward_ratio'):
+            df[col] = None
+
+        def truthy(col):
+            # Même sémantique que les tests `if self.x` de save() (None et 0 exclus)
+            return df[col].notna() & df[col].ne(0)
+
+        def ratio(reward, risk):
+            return [abs(rw) / rk if rk > 0 else None for rw, rk in zip(reward, risk)]
+
+        is_long = df['trade_type'] == 'Long'
+
+        # Durée et jour de trading
+        mask = df['entered_at'].notna() & df['exited_at'].notna()
+        df.loc[mask, 'trade_duration'] = [
+            exited - entered for entered, exited in zip(df.loc[mask, 'entered_at'], df.loc[mask, 'exited_at'])
+        ]
+        df['trade_day'] = df['entered_at'].map(lambda d: d.date() if d is not None else None)
+
+        # R:R prévu
+        mask = truthy('entry_price') & truthy('planned_stop_loss') & truthy('planned_take_profit') & truthy('trade_type')
+        if mask.any():
+            sub, long_ = df[mask], is_long[mask]
+            risk = (sub['entry_price'] - sub['planned_stop_loss']).where(long_, sub['planned_stop_loss'] - sub['entry_price'])
+            reward = (sub['planned_take_profit'] - sub['entry_price']).where(long_, sub['entry_price'] - sub['planned_take_profit'])
+            df.loc[mask, 'planned_risk_reward_ratio'] = ratio(reward, risk)
+
+        # R:R réel
+        mask = truthy('entry_price') & truthy('exit_price') & truthy('planned_stop_loss') & truthy('trade_type')
+        if mask.any():
+            sub, long_ = df[mask], is_long[mask]
+            risk = (sub['entry_price'] - sub['planned_stop_loss']).where(long_, sub['planned_stop_loss'] - sub['entry_price'])
+            reward = (sub['exit_price'] - sub['entry_price']).where(long_, sub['entry_price'] - sub['exit_price'])
+            df.loc[mask, 'actual_risk_reward_ratio'] = ratio(reward, risk)
+
+        # PnL brut (uniquement s'il n'est pas fourni)
+        mask = df['pnl'].isna() & truthy('entry_price') & truthy('exit_price') & truthy('size') & truthy('trade_type')
+        if mask.any():
+            sub, long_ = df[mask], is_long[mask]
+            price_diff = (sub['exit_price'] - sub['entry_price']).where(long_, sub['entry_price'] - sub['exit_price'])
+            has_point_value = truthy('point_value')[mask]
+            pnl = price_diff * sub['size']
+            pnl[has_point_value] = price_diff[has_point_value] * sub.loc[has_point_value, 'point_value'] * sub.loc[has_point_value, 'size']
+            df.loc[mask, 'pnl'] = pnl
+
+        # PnL net et pourcentage
+        mask = df['pnl'].notna()
+        if mask.any():
+            sub = df[mask]
+            df.loc[mask, 'net_pnl'] = sub['pnl'] - sub['fees'] - sub['commissions']
+        mask = mask & truthy('entry_price') & truthy('size')
+        if mask.any():
+            sub = df[mask]
+            investment = sub['entry_price'] * sub['size']
+            df.loc[mask, 'pnl_percentage'] = [
+                (net / inv) * _DEC_HUNDRED if inv > 0 else None
+                for net, inv in zip(sub['net_pnl'], investment)
+            ]
+        return df
+
     @property
     def is_profitable(self):
         """Indique si le trade est profitable."""
         return self.net_pnl > 0 if self.net_pnl is not None else None
     
-    @property
+    def get_raw_data(self):
+        """Données sources du trade : raw_data, sinon la ligne relue dans le CSV archivé de l'import."""
+        if self.raw_data is not None:
+            return self.raw_data
+        if self.source_import_id and self.source_line_no:  # type: ignore[attr-defined]
+            return self.source_import.get_row(self.source_line_no)  # type: ignore[union-attr]
+        return None
+    
+    @cached_property
     def duration_str(self):
         """Retourne la durée au format lisible."""
         if self.trade_duration:
@@ -854,31 +1125,31 @@ class ImportedTrade(models.Model):
             return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
         return None
     
-    @property
+    @cached_property
     def formatted_entry_date(self):
         """Retourne la date d'entrée au format européen DD/MM/YYYY HH:MM:SS."""
         return self.entered_at.strftime('%d/%m/%Y %H:%M:%S')  # type: ignore
     
-    @property
+    @cached_property
     def formatted_exit_date(self):
         """Retourne la date de sortie au format européen DD/MM/YYYY HH:MM:SS."""
         if self.exited_at:
             return self.exited_at.strftime('%d/%m/%Y %H:%M:%S')  # type: ignore
         return None
     
-    @property
+    @cached_property
     def formatted_entry_price(self):
         """Retourne le prix d'entrée au format européen avec virgule."""
         return str(self.entry_price).replace('.', ',')
     
-    @property
+    @cached_property
     def formatted_exit_price(self):
         """Retourne le prix de sortie au format européen avec virgule."""
         if self.exit_price:
             return str(self.exit_price).replace('.', ',')
         return None
     
-    @property
+    @cached_property
     def formatted_pnl(self):
         """Retourne le PnL au format européen avec virgule."""
         if self.pnl:
@@ -891,33 +1162,43 @@ class ImportedTrade(models.Model):
         Convertit une date au format américain TopStep vers datetime Python.
         Format attendu: 10/08/2025 18:23:28 +02:00 (MM/DD/YYYY HH:MM:SS +TZ)
         """
+        match = _US_DATETIME_RE.match(date_str)
+        if match:
+            month, day, year, time_part, tz_part = match.groups()
+            try:
+                return datetime.fromisoformat(f'{year}-{month}-{day}T{time_part}{tz_part}').astimezone(_UTC)
+            except ValueError:
+                pass  # date impossible (ex. 02/30) : le chemin strptime ci-dessous produit le message d'erreur
         try:
             # Séparer la date et le timezone
             parts = date_str.rsplit(' ', 1)
             date_part = parts[0]
             tz_part = parts[1] if len(parts) > 1 else '+00:00'
             
-            # Parser la date (format américain MM/DD/YYYY)
-            dt = datetime.strptime(date_part, '%m/%d/%Y %H:%M:%S')
-            
-            # Gérer le timezone
-            tz_hours = int(tz_part[1:3])
-            tz_minutes = int(tz_part[4:6])
-            tz_offset = timedelta(hours=tz_hours, minutes=tz_minutes)
-            if tz_part[0] == '-':
-                tz_offset = -tz_offset
-            
-            # Créer un timezone aware datetime
-            from django.utils import timezone as django_tz
-            # La date_str contient déjà l'heure locale avec le décalage
-            # On doit soustraire le décalage pour obtenir UTC
-            dt = django_tz.make_aware(dt, pytz.UTC)
-            dt = dt - tz_offset
-            
-            return dt
+            # Parser la date (format américain MM/DD/YYYY) avec son décalage, puis convertir en UTC
+            return datetime.strptime(date_part, _US_DATETIME_FORMAT).replace(
+                tzinfo=_fixed_offset_tz(tz_part)
+            ).astimezone(_UTC)
         except Exception as e:
             raise ValueError(f"Erreur lors du parsing de la date '{date_str}': {str(e)}")
     
+    @classmethod
+    def parse_us_datetimes(cls, values):
+        """
+        Variante vectorisée de parse_us_datetime pour une colonne entière d'import (boucle C de pandas).
+        Les valeurs vides ou non reconnues donnent None : l'appelant repasse alors par
+        parse_us_datetime pour obtenir le message d'erreur de la ligne.
+        """
+        import pandas as pd
+
+        if not values:
+            return []
+        series = pd.Series(values, dtype=object).fillna('').astype(str).str.strip()
+        # '+02:00' -> '+0200' : format %z fixe, reste sur le chemin rapide de to_datetime
+        series = series.str.replace(r' ([+-]\d{2}):(\d{2})$', r'\1\2', regex=True)
+        parsed = pd.to_datetime(series, format=_US_DATETIME_FORMAT + '%z', utc=True, errors='coerce')
+        return [None if pd.isna(ts) else ts.to_pydatetime().replace(tzinfo=_UTC) for ts in parsed]
+    
     @classmethod
     def parse_us_decimal(cls, value_str):
         """
@@ -925,9 +1206,10 @@ class ImportedTrade(models.Model):
         Format attendu: 25261.750000000
         """
         try:
-            if not value_str or value_str.strip() == '':
+            if not value_str or value_str.isspace():
                 return None
-            return Decimal(value_str.strip())
+            # Decimal tolère les espaces en bordure : pas de strip() (copie) par cellule
+            return Decimal(value_str)
         except Exception as e:
             raise ValueError(f"Erreur lors du parsing du nombre '{value_str}': {str(e)}")
     
@@ -941,18 +1223,14 @@ class ImportedTrade(models.Model):
             if not duration_str or duration_str.strip() == '':
                 return None
             
-            # Séparer les secondes et les microsecondes
-            if '.' in duration_str:
-                time_part, micro_part = duration_str.split('.')
-                microseconds = int(micro_part[:6].ljust(6, '0'))  # Prendre les 6 premiers chiffres
-            else:
-                time_part = duration_str
-                microseconds = 0
-            
-            # Parser HH:MM:SS
-            hours, minutes, seconds = map(int, time_part.split(':'))
-            
-            return timedelta(hours=hours, minutes=minutes, seconds=seconds, microseconds=microseconds)
+            match = _DURATION_RE.match(duration_str.strip())
+            if not match:
+                raise ValueError("format HH:MM:SS[.fraction] attendu")
+            hours, minutes, seconds, fraction = match.groups()
+            # Prendre les 6 premiers chiffres de la fraction (microsecondes)
+            microseconds = int(fraction[:6].ljust(6, '0')) if fraction else 0
+
+            return timedelta(hours=int(hours), minutes=int(minutes), seconds=int(seconds), microseconds=microseconds)
         except Exception as e:
             raise ValueError(f"Erreur lors du parsing de la durée '{duration_str}': {str(e)}")
 
@@ -1029,6 +1307,12 @@ class TopStepImportLog(models.Model):
         blank=True,
         verbose_name='Détails des erreurs'
     )
+    csv_content = models.TextField(
+        blank=True,
+        default='',
+        verbose_name='Contenu du fichier',
+        help_text='Fichier CSV importé, archivé pour relire la ligne source des trades'
+    )
     imported_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Importé le'
@@ -1041,6 +1325,39 @@ class TopStepImportLog(models.Model):
     
     def __str__(self):
         return f"{self.filename} - {self.imported_at.strftime('%d/%m/%Y %H:%M')}"  # type: ignore
+    
+    @cached_property
+    def _csv_rows(self):
+        """Enregistrements du CSV archivé, parsés une seule fois par instance (en-tête compris)."""
+        if not self.csv_content:
+            return []
+        # io.StringIO et non splitlines() : un champ entre guillemets peut contenir des retours à la ligne
+        return list(csv.reader(io.StringIO(self.csv_content)))
+
+    def get_row(self, line_no):
+        """Retourne l'enregistrement line_no du CSV archivé (numérotation de l'import : en-tête = 1)."""
+        rows = self._csv_rows
+        if not rows or line_no is None or not 2 <= line_no <= len(rows):
+            return None
+        return dict(zip(rows[0], rows[line_no - 1]))
+
+
+class TradeStrategyQuerySet(models.QuerySet):
+    """QuerySet des stratégies de trade."""
+
+    def with_trade(self):
+        """Joint trade et user : __str__ et le serializer les lisent sur chaque ligne."""
+        return self.select_related('trade', 'user')
+
+    def light(self):
+        """
+        Diffère les textes libres de la stratégie et les colonnes lourdes du trade joint :
+        pour les agrégations par jour qui ne lisent que les indicateurs et le PnL.
+        """
+        return self.defer(
+            'emotion_details', 'possible_improvements',
+            'trade__raw_data', 'trade__notes', 'trade__strategy',
+        )
 
 
 class TradeStrategy(models.Model):
@@ -1068,6 +1385,7 @@ class TradeStrategy(models.Model):
         ('lassitude', 'Lassitude'),
         ('fatigue', 'Fatigue'),
     ]
+    EMOTION_LABELS = dict(EMOTION_CHOICES)
     
     SESSION_RATING_CHOICES = [
         (1, '1 - Très mauvaise'),
@@ -1086,11 +1404,13 @@ class TradeStrategy(models.Model):
     )
     
     # Lien vers le trade importé
+    # Pas d'index dédié : l'index (trade, strategy_respected) couvre les recherches par trade (et le CASCADE)
     trade = models.ForeignKey(
         ImportedTrade,
         on_delete=models.CASCADE,
         related_name='strategy_data',
-        verbose_name='Trade associé'
+        verbose_name='Trade associé',
+        db_index=False,
     )
     
     # Respect de la stratégie
@@ -1182,12 +1502,13 @@ class TradeStrategy(models.Model):
         unique_together = ['user', 'trade']
         indexes = [
             models.Index(fields=['user', '-created_at']),
-            models.Index(fields=['trade']),
             # Optimisation StrategiesPage : filtres par user + strategy_respected
             models.Index(fields=['user', 'strategy_respected']),
             # Optimisation StrategiesPage : filtres par trade + strategy_respected
             models.Index(fields=['trade', 'strategy_respected']),
         ]
+
+    objects = TradeStrategyQuerySet.as_manager()
     
     def __str__(self):
         return f"Stratégie {self.trade.contract_name} - {self.trade.entered_at.strftime('%d/%m/%Y')}"  # type: ignore
@@ -1197,8 +1518,54 @@ class TradeStrategy(models.Model):
         """Retourne les émotions au format lisible."""
         if not self.dominant_emotions:
             return "Aucune"
-        emotion_labels = dict(self.EMOTION_CHOICES)
-        return ", ".join([emotion_labels.get(emotion, emotion) for emotion in self.dominant_emotions])  # type: ignore
+        return ", ".join([self.EMOTION_LABELS.get(emotion, emotion) for emotion in self.dominant_emotions])  # type: ignore
+
+
+class PositionStrategyQuerySet(models.QuerySet):
+    """QuerySet des stratégies de position."""
+
+    def metadata(self):
+        """Diffère strategy_content (JSON non borné) : recharger par pk si le contenu est nécessaire."""
+        return self.defer('strategy_content')
+
+    def with_latest_flag(self):
+        """
+        Annote annotated_is_latest_version (version >= MAX(version) du groupe) par sous-requête corrélée.
+        Pas de fonction fenêtre : elle ne verrait que les lignes filtrées (ex. is_current=True).
+        """
+        queryset = self.annotate(_version_group_id=Coalesce('parent_strategy', 'id'))
+        group_max = (
+            PositionStrategy.objects.filter(  # type: ignore
+                models.Q(pk=models.OuterRef('_version_group_id'))
+                | models.Q(parent_strategy=models.OuterRef('_version_group_id'))
+            )
+            .order_by()
+            .values('user')
+            .annotate(max_version=models.Max('version'))
+            .values('max_version')
+        )
+        return queryset.annotate(
+            annotated_is_latest_version=models.ExpressionWrapper(
+                models.Q(version__gte=models.Subquery(group_max)),
+                output_field=models.BooleanField(),
+            )
+        )
+
+    def with_version_count(self):
+        """
+        Annote annotated_version_count (racine + versions enfants du groupe) par sous-requête corrélée :
+        même résultat que le repli du serializer, y compris pour une version enfant.
+        """
+        children = (
+            PositionStrategy.objects.filter(parent_strategy=models.OuterRef('_version_group_id'))  # type: ignore
+            .order_by()
+            .values('parent_strategy')
+            .annotate(n=models.Count('id'))
+            .values('n')
+        )
+        return self.annotate(_version_group_id=Coalesce('parent_strategy', 'id')).annotate(
+            annotated_version_count=Coalesce(models.Subquery(children), 0) + 1
+        )
 
 
 class PositionStrategy(models.Model):
@@ -1211,6 +1578,8 @@ class PositionStrategy(models.Model):
         ('archived', 'Archivée'),
         ('draft', 'Brouillon'),
     ]
+    # Libellés indexés une fois pour __str__
+    STATUS_LABELS = dict(STRATEGY_STATUS_CHOICES)
     
     # Identification
     user = models.ForeignKey(
@@ -1309,16 +1678,27 @@ class PositionStrategy(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Stratégie de Position'
         verbose_name_plural = 'Stratégies de Position'
+        # L'index unique (user, parent_strategy, version) sert aussi les lectures du groupe de versions
+        # (filtre user + parent_strategy, tri par version) ; parent_strategy seul est couvert par l'index de la FK.
         unique_together = ['user', 'parent_strategy', 'version']
         indexes = [
             models.Index(fields=['user', '-created_at']),
             models.Index(fields=['user', 'is_current']),
-            models.Index(fields=['parent_strategy']),
             models.Index(fields=['user', 'status', '-created_at']),  # Optimisation pour filtres par status (archived, active, draft)
         ]
+        constraints = [
+            # Une seule version actuelle par groupe (la racine a parent_strategy NULL : clé = son propre id)
+            models.UniqueConstraint(
+                Coalesce('parent_strategy', 'id'),
+                condition=models.Q(is_current=True),
+                name='one_current_per_strategy',
+            ),
+        ]
+    
+    objects = PositionStrategyQuerySet.as_manager()
     
     def __str__(self):
-        return f"{self.title} v{self.version} - {self.get_status_display()}"  # type: ignore
+        return f"{self.title} v{self.version} - {self.STATUS_LABELS.get(self.status, self.status)}"
     
     def save(self, *args, **kwargs):
         """Override save pour gérer le versioning automatique."""
@@ -1327,47 +1707,59 @@ class PositionStrategy(models.Model):
             self.version_published_at = timezone.now()
         if not self.pk:  # Nouvelle stratégie
             # Marquer toutes les autres versions comme non actuelles
-            if self.parent_strategy:
-                # Marquer toutes les versions du groupe (parent + enfants) comme non actuelles
-                parent = self.parent_strategy
-                parent_id = self.parent_strategy_id  # type: ignore
-                PositionStrategy.objects.filter(  # type: ignore
-                    models.Q(id=parent_id) | models.Q(parent_strategy=parent),
-                    user=self.user
-                ).update(is_current=False)
-                # Utiliser le numéro de version maximum + 1 au lieu de count() + 1
-                # Prendre en compte à la fois les versions enfants et la stratégie parente elle-même
-                max_child_version = parent.versions.aggregate(  # type: ignore
-                    max_version=models.Max('version')
-                )['max_version'] or 0
-                parent_version = parent.version or 0  # type: ignore
-                max_version = max(max_child_version, parent_version)
-                self.version = max_version + 1
-            else:
-                # Première version
-                self.version = 1
+            if self.parent_strategy_id:  # type: ignore
+                # Démotion du groupe, calcul du numéro et insertion dans la même transaction.
+                # Verrou sur la racine : deux créations concurrentes du même groupe sont sérialisées
+                # (sinon même MAX(version) lu des deux côtés -> violation de l'unicité).
+                with transaction.atomic():
+                    list(
+                        PositionStrategy.objects.select_for_update()  # type: ignore
+                        .filter(pk=self.parent_strategy_id)  # type: ignore
+                        .order_by()
+                        .values_list('pk', flat=True)
+                    )
+                    # Un seul UPDATE (parent inclus), limité aux lignes encore actuelles ; update() ignore
+                    # auto_now, d'où updated_at explicite (horodatage Python : NOW() SQL vaut le début de transaction)
+                    from django.utils import timezone
+                    self._version_group(self.parent_strategy_id).filter(  # type: ignore
+                        is_current=True
+                    ).update(is_current=False, updated_at=timezone.now())
+                    self.version = self._next_version_number(self.parent_strategy_id)  # type: ignore
+                    super().save(*args, **kwargs)
+                return
+            # Première version
+            self.version = 1
         super().save(*args, **kwargs)
+
+    def _version_group(self, parent_id):
+        """Versions du groupe (la stratégie parente et toutes ses versions enfants)."""
+        return PositionStrategy.objects.filter(  # type: ignore
+            models.Q(id=parent_id) | models.Q(parent_strategy_id=parent_id),
+            user=self.user
+        )
+
+    def _next_version_number(self, parent_id):
+        """MAX(version) + 1 sur le groupe en un seul agrégat (parent inclus, versions supprimées ignorées)."""
+        return self._version_group(parent_id).aggregate(
+            next_v=Coalesce(models.Max('version'), 0)
+        )['next_v'] + 1
     
     @property
     def is_latest_version(self):
-        """Vérifie si c'est la version avec le numéro le plus élevé (la plus récente créée)."""
+        """Vérifie si c'est la version avec le numéro le plus élevé (valeur annotée par with_latest_flag() si présente)."""
+        annotated = self.__dict__.get('annotated_is_latest_version')
+        if annotated is not None:
+            return annotated
         try:
             # Identifier le parent (soit self si c'est le parent, soit parent_strategy)
-            parent = self.parent_strategy or self
             parent_id = self.parent_strategy_id if self.parent_strategy_id else self.pk  # type: ignore
             
-            # Récupérer toutes les versions du groupe (parent + enfants)
-            all_versions = PositionStrategy.objects.filter(  # type: ignore
-                models.Q(id=parent_id) | models.Q(parent_strategy=parent),
-                user=self.user
-            )
-            
-            # Trouver la version avec le numéro le plus élevé
-            latest = all_versions.order_by('-version').first()
-            if latest is None:
+            # Comparer au MAX(version) du groupe : un scalaire plutôt qu'une ligne complète (strategy_content JSON)
+            max_version = self._version_group(parent_id).aggregate(m=models.Max('version'))['m']
+            if max_version is None:
                 return True
             
-            return self == latest
+            return self.version >= max_version
         except Exception as e:
             # En cas d'erreur (relation cassée, etc.), considérer comme dernière version
             import logging
@@ -1379,15 +1771,10 @@ class PositionStrategy(models.Model):
         """Retourne l'historique des versions (parent + toutes les versions enfants)."""
         try:
             # Identifier le parent (soit self si c'est le parent, soit parent_strategy)
-            parent = self.parent_strategy or self
             parent_id = self.parent_strategy_id if self.parent_strategy_id else self.pk  # type: ignore
             
-            # Retourner toutes les versions du groupe : le parent + tous ses enfants
-            # Utiliser Q pour inclure le parent (id=parent_id) et tous ses enfants (parent_strategy=parent)
-            return PositionStrategy.objects.filter(  # type: ignore
-                models.Q(id=parent_id) | models.Q(parent_strategy=parent),
-                user=self.user
-            ).order_by('-version')
+            # Retourner toutes les versions du groupe : le parent + tous ses enfants, sans le contenu JSON
+            return self._version_group(parent_id).metadata().with_latest_flag().order_by('-version')
         except Exception as e:
             # En cas d'erreur, retourner un queryset vide
             import logging
@@ -1398,34 +1785,13 @@ class PositionStrategy(models.Model):
     def create_new_version(self, new_content, version_notes=''):
         """Crée une nouvelle version de la stratégie."""
         # Déterminer le parent : si parent_strategy_id existe, récupérer depuis la DB, sinon c'est cette stratégie
+        # (instance complète : elle reste en cache sur la nouvelle version, lue par le serializer)
         if self.parent_strategy_id:
             # C'est une version enfant, récupérer le parent depuis la DB
             parent = PositionStrategy.objects.get(id=self.parent_strategy_id)  # type: ignore
-            parent_id = self.parent_strategy_id  # type: ignore
         else:
             # C'est le parent lui-même
             parent = self
-            parent_id = self.pk  # type: ignore
-        
-        # Marquer toutes les versions de ce parent (y compris le parent lui-même) comme non actuelles
-        # Utiliser Q pour inclure le parent et tous ses enfants
-        PositionStrategy.objects.filter(  # type: ignore
-            models.Q(id=parent_id) | models.Q(parent_strategy=parent),
-            user=self.user
-        ).update(is_current=False)
-        
-        # IMPORTANT: Rafraîchir l'objet self depuis la base de données pour avoir la valeur is_current=False
-        # car update() ne met pas à jour l'objet en mémoire
-        self.refresh_from_db()
-        
-        # Calculer le nouveau numéro de version en utilisant le maximum + 1
-        # Cela garantit qu'on utilise toujours le numéro le plus élevé, même si des versions sont supprimées
-        from django.db.models import Max
-        parent_version = getattr(parent, 'version', None) or 0  # type: ignore
-        max_version = parent.versions.aggregate(  # type: ignore
-            max_version=Max('version')
-        )['max_version'] or parent_version
-        new_version = max_version + 1
         
         # Préserver created_at de la version originale (parent_strategy)
         original_created_at = parent.created_at
@@ -1433,35 +1799,88 @@ class PositionStrategy(models.Model):
         from django.utils import timezone
         published_at = timezone.now()
 
-        new_strategy = PositionStrategy.objects.create(  # type: ignore
-            user=self.user,
-            parent_strategy=parent,
-            title=self.title,
-            description=self.description,
-            strategy_content=new_content,
-            version_notes=version_notes,
-            status=self.status,
-            version=new_version,
-            is_current=True,  # La nouvelle version est actuelle
-            example_screenshot=self.example_screenshot,
-            example_screenshot_thumbnail=self.example_screenshot_thumbnail,
-            version_published_at=published_at,
-        )
-        
-        # Préserver created_at de la version originale en faisant un update
-        # car auto_now_add=True l'a défini à maintenant lors de la création
-        PositionStrategy.objects.filter(id=new_strategy.id).update(created_at=original_created_at)  # type: ignore
-        new_strategy.refresh_from_db()  # Rafraîchir pour avoir la bonne valeur de created_at
-        
-        # Archiver l'ancienne version si elle était active
-        # is_current est déjà False grâce au refresh_from_db() ci-dessus
-        if self.status == 'active':
-            self.status = 'archived'
-            self.save(update_fields=['status'])
+        with transaction.atomic():
+            # save() démote tout le groupe (parent inclus) et attribue MAX(version) + 1
+            new_strategy = PositionStrategy.objects.create(  # type: ignore
+                user=self.user,
+                parent_strategy=parent,
+                title=self.title,
+                description=self.description,
+                strategy_content=new_content,
+                version_notes=version_notes,
+                status=self.status,
+                is_current=True,  # La nouvelle version est actuelle
+                example_screenshot=self.example_screenshot,
+                example_screenshot_thumbnail=self.example_screenshot_thumbnail,
+                version_published_at=published_at,
+            )
+            
+            # Préserver created_at de la version originale en faisant un update
+            # car auto_now_add=True l'a défini à maintenant lors de la création
+            PositionStrategy.objects.filter(id=new_strategy.id).update(created_at=original_created_at)  # type: ignore
+            new_strategy.created_at = original_created_at
+            
+            # update() ne touche pas l'objet en mémoire : on aligne is_current sans relire la ligne,
+            # ce qui conserve aussi les champs modifiés par l'appelant avant la copie
+            self.is_current = False
+            
+            # Archiver l'ancienne version si elle était active, dans la même transaction
+            # que la création (is_current est déjà False, aligné ci-dessus)
+            if self.status == 'active':
+                self.status = 'archived'
+                self.save(update_fields=['status', 'updated_at'])
         
         return new_strategy
 
 
+class TradingGoalQuerySet(models.QuerySet):
+    """QuerySet des objectifs de trading."""
+
+    def with_account(self):
+        """Charge le compte de trading en jointure (__str__ et sérialiseurs lisent trading_account.name)."""
+        return self.select_related('trading_account')
+
+    def with_progress(self):
+        """
+        Annote annotated_progress_percentage calculé en SQL (même règle que la propriété
+        progress_percentage : threshold_target, sinon target_value ; selon la direction).
+        """
+        target = Coalesce('threshold_target', 'target_value', models.Value(_DEC_ZERO))
+        current = Coalesce('current_value', models.Value(_DEC_ZERO))
+        hundred = models.Value(_DEC_HUNDRED)
+        return self.annotate(
+            _progress_target=target,
+            annotated_progress_percentage=models.Case(
+                models.When(_progress_target=0, then=models.Value(0.0)),
+                models.When(
+                    direction='minimum',
+                    then=Cast(Least(hundred, current * hundred / models.F('_progress_target')), models.FloatField()),
+                ),
+                models.When(_progress_target__lte=current, then=models.Value(0.0)),
+                default=Cast(
+                    Least(hundred, (models.F('_progress_target') - current) * hundred / models.F('_progress_target')),
+                    models.FloatField(),
+                ),
+                output_field=models.FloatField(),
+            ),
+        )
+
+    def in_danger(self, as_of=None):
+        """
+        Objectifs actifs « en danger » encore à alerter, filtrés en SQL (mêmes règles que _apply_progress) :
+        progression < 50 %, moins de 7 jours restants, dernière alerte absente ou de plus de 24 h.
+        """
+        from django.utils import timezone
+        as_of = as_of or timezone.now()
+        return self.with_progress().filter(
+            models.Q(last_danger_alert_sent__isnull=True)
+            | models.Q(last_danger_alert_sent__lt=as_of - timedelta(days=1)),
+            status='active',
+            end_date__lt=as_of.date() + timedelta(days=7),
+            annotated_progress_percentage__lt=50,
+        )
+
+
 class TradingGoal(models.Model):
     """
     Modèle pour gérer les objectifs de trading (goals).
@@ -1491,6 +1910,10 @@ class TradingGoal(models.Model):
         ('custom', 'Personnalisé'),
     ]
     
+    # Libellés indexés une fois pour __str__
+    GOAL_TYPE_LABELS = dict(GOAL_TYPE_CHOICES)
+    PERIOD_TYPE_LABELS = dict(PERIOD_TYPE_CHOICES)
+    
     STATUS_CHOICES = [
         ('active', 'En cours'),
         ('achieved', 'Atteint'),
@@ -1648,16 +2071,28 @@ class TradingGoal(models.Model):
         indexes = [
             models.Index(fields=['user', 'status']),
             models.Index(fields=['user', 'period_type', 'start_date', 'end_date']),
-            models.Index(fields=['trading_account']),
+            # Objectifs actifs d'un utilisateur dans l'ordre du Meta (liste UI, update_all_progress)
+            models.Index(
+                fields=['user', '-priority', '-created_at'],
+                name='tg_user_prio_created_idx',
+                condition=models.Q(status='active'),
+            ),
         ]
     
+    objects = TradingGoalQuerySet.as_manager()
+    
     def __str__(self):
         account_name = self.trading_account.name if self.trading_account else "Tous les comptes"
-        return f"{self.get_goal_type_display()} - {account_name} ({self.get_period_type_display()})"  # type: ignore
+        goal_type = self.GOAL_TYPE_LABELS.get(self.goal_type, self.goal_type)
+        period_type = self.PERIOD_TYPE_LABELS.get(self.period_type, self.period_type)
+        return f"{goal_type} - {account_name} ({period_type})"
     
     @property
     def progress_percentage(self):
-        """Calcule le pourcentage de progression."""
+        """Calcule le pourcentage de progression (valeur annotée par with_progress() si présente)."""
+        annotated = self.__dict__.get('annotated_progress_percentage')
+        if annotated is not None:
+            return annotated
         # Utiliser threshold_target si disponible, sinon target_value pour rétrocompatibilité
         target_val = float(self.threshold_target) if self.threshold_target is not None else (float(self.target_value) if self.target_value is not None else 0)  # type: ignore
         current_val = float(self.current_value) if self.current_value is not None else 0  # type: ignore
@@ -1729,8 +2164,11 @@ class TradingGoal(models.Model):
     def remaining_days(self):
         """Calcule le nombre de jours restants."""
         from django.utils import timezone
+        return self._remaining_days_at(timezone.now().date())
+    
+    def _remaining_days_at(self, today):
+        """Jours restants jusqu'à end_date à partir de la date fournie (0 si dépassée)."""
         from datetime import date
-        today = timezone.now().date()
         end_date_value = self.end_date  # type: ignore
         if end_date_value is None:
             return 0
@@ -1758,36 +2196,93 @@ class TradingGoal(models.Model):
             return
         
         from .services import GoalProgressCalculator
+        
+        fields_to_update = self._apply_progress(GoalProgressCalculator().calculate_progress(self))
+        
+        # Rien n'a changé : pas d'UPDATE (ni de réécriture d'updated_at)
+        if fields_to_update:
+            self.save(update_fields=fields_to_update + ['updated_at'])
+    
+    @classmethod
+    def bulk_update_progress(cls, goals):
+        """
+        Met à jour la progression d'un lot d'objectifs : un seul calculateur, valeurs PnL total /
+        nombre de trades agrégées en une requête, puis un bulk_update des objectifs modifiés.
+        Retourne le nombre d'objectifs recalculés (les objectifs annulés sont ignorés).
+        """
+        from .services import GoalProgressCalculator
         from django.utils import timezone
-        from datetime import timedelta
         
+        goals = [goal for goal in goals if goal.status != 'cancelled']
         calculator = GoalProgressCalculator()
-        progress_data = calculator.calculate_progress(self)
+        calculator.prefetch_trade_aggregates(goals)
+        
+        now = timezone.now()
+        changed_goals = []
+        for goal in goals:
+            if goal._apply_progress(calculator.calculate_progress(goal), check_danger=False):
+                # bulk_update ne déclenche pas auto_now
+                goal.updated_at = now
+                changed_goals.append(goal)
+        
+        if changed_goals:
+            cls.objects.bulk_update(  # type: ignore
+                changed_goals,
+                ['current_value', 'status', 'last_achieved_alert_sent', 'updated_at'],
+                batch_size=500,
+            )
+        
+        # Alertes "objectif en danger" : candidats filtrés en SQL sur les valeurs à jour
+        if goals:
+            from .tasks import schedule_goal_alert_email
+            endangered = list(cls.objects.filter(pk__in=[goal.pk for goal in goals]).in_danger(now))  # type: ignore
+            for goal in endangered:
+                schedule_goal_alert_email(goal.pk, 'danger')
+                goal.last_danger_alert_sent = now
+            if endangered:
+                cls.objects.bulk_update(endangered, ['last_danger_alert_sent'], batch_size=500)  # type: ignore
+        return len(goals)
+    
+    def _apply_progress(self, progress_data, check_danger=True):
+        """
+        Applique un résultat du calculateur (valeur, statut, alertes) ; retourne les champs modifiés.
+        check_danger=False laisse l'alerte "en danger" à l'appelant (voir bulk_update_progress).
+        """
+        from django.utils import timezone
+        from datetime import timedelta
         
         old_status = self.status
-        self.current_value = progress_data['current_value']
+        fields_to_update = []
+        if self.current_value != progress_data['current_value']:
+            self.current_value = progress_data['current_value']
+            fields_to_update.append('current_value')
+            # Une progression annotée (with_progress) ne reflète plus la nouvelle valeur
+            self.__dict__.pop('annotated_progress_percentage', None)
         
         # Mettre à jour le statut si nécessaire (mais ne pas écraser 'cancelled')
         if progress_data['status'] != self.status and self.status != 'cancelled':
             self.status = progress_data['status']
+            fields_to_update.append('status')
         
         # Envoyer des alertes si nécessaire
         now = timezone.now()
-        fields_to_update = ['current_value', 'status', 'updated_at']
         
         # Alerte "objectif atteint" : envoyer uniquement quand le statut passe à 'achieved'
         if self.status == 'achieved' and old_status != 'achieved':
-            from .goal_alerts import send_goal_achieved_email
-            send_goal_achieved_email(self)
+            from .tasks import schedule_goal_alert_email
+            schedule_goal_alert_email(self.pk, 'achieved')
             self.last_achieved_alert_sent = now
             fields_to_update.append('last_achieved_alert_sent')
         
         # Alerte "objectif en danger" : envoyer si progression < 50% et moins de 7 jours restants
-        # Limiter à une alerte par jour maximum
-        progress_percentage = self.progress_percentage
-        remaining_days = self.remaining_days
-        
-        is_in_danger = progress_percentage < 50 and remaining_days < 7 and self.status == 'active'
+        # Limiter à une alerte par jour maximum. Tests du moins coûteux au plus coûteux : la
+        # progression (conversions Decimal -> float) n'est calculée que pour un objectif actif proche de l'échéance.
+        is_in_danger = (
+            check_danger
+            and self.status == 'active'
+            and self._remaining_days_at(now.date()) < 7
+            and self.progress_percentage < 50
+        )
         should_send_danger_alert = False
         
         if is_in_danger:
@@ -1799,12 +2294,12 @@ class TradingGoal(models.Model):
                 should_send_danger_alert = True
         
         if should_send_danger_alert:
-            from .goal_alerts import send_goal_danger_email
-            send_goal_danger_email(self)
+            from .tasks import schedule_goal_alert_email
+            schedule_goal_alert_email(self.pk, 'danger')
             self.last_danger_alert_sent = now
             fields_to_update.append('last_danger_alert_sent')
         
-        self.save(update_fields=fields_to_update)
+        return fields_to_update
 
 
 class DayStrategyCompliance(models.Model):
@@ -1833,6 +2328,7 @@ class DayStrategyCompliance(models.Model):
         ('lassitude', 'Lassitude'),
         ('fatigue', 'Fatigue'),
     ]
+    EMOTION_LABELS = dict(EMOTION_CHOICES)
     
     SESSION_RATING_CHOICES = [
         (1, '1 - Très mauvaise'),
@@ -1955,8 +2451,7 @@ class DayStrategyCompliance(models.Model):
         """Retourne les émotions au format lisible."""
         if not self.dominant_emotions:
             return "Aucune"
-        emotion_labels = dict(self.EMOTION_CHOICES)
-        return ", ".join([emotion_labels.get(emotion, emotion) for emotion in self.dominant_emotions])  # type: ignore
+        return ", ".join([self.EMOTION_LABELS.get(emotion, emotion) for emotion in self.dominant_emotions])  # type: ignore
 
 
 class ExportTemplate(models.Model):
@@ -2011,18 +2506,34 @@ class ExportTemplate(models.Model):
         verbose_name_plural = 'Templates d\'export'
         unique_together = ['user', 'name']
         indexes = [
-            models.Index(fields=['user', 'is_default']),
+            # Pas d'index (user, is_default) : la recherche du template par défaut
+            # utilise l'index partiel de uniq_default_export_template.
             models.Index(fields=['user', 'name']),
         ]
+        constraints = [
+            # Au plus un template par défaut par utilisateur et par format
+            models.UniqueConstraint(
+                fields=['user', 'format'],
+                condition=models.Q(is_default=True),
+                name='uniq_default_export_template',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.get_format_display()})"
     
     def save(self, *args, **kwargs):
-        """Si ce template est défini comme défaut, retirer le flag des autres."""
-        if self.is_default:
-            ExportTemplate.objects.filter(
-                user=self.user,
+        """
+        Si ce template est le défaut de son format, retirer le flag des autres.
+        UPDATE filtré sans relecture préalable : il ne touche aucune ligne quand aucun autre
+        template n'est le défaut, et la contrainte partielle garantit l'unicité.
+        """
+        update_fields = kwargs.get('update_fields')
+        if self.is_default and (
+            update_fields is None or not {'is_default', 'format'}.isdisjoint(update_fields)
+        ):
+            ExportTemplate.objects.filter(  # type: ignore
+                user_id=self.user_id,  # type: ignore
                 format=self.format,
                 is_default=True
             ).exclude(pk=self.pk).update(is_default=False)
@@ -76,7 +76,10 @@ class TradingAccountSerializer(serializers.ModelSerializer):
         read_only_fields = ['user', 'created_at', 'updated_at', 'accounts_copying_this_one']
 
     def get_accounts_copying_this_one(self, obj):
-        qs = obj.accounts_that_copy_me.filter(status='active').order_by('name')
+        # Préchargé (actifs, triés) par TradingAccountViewSet ; requête dédiée sinon
+        qs = getattr(obj, 'active_copying_accounts', None)
+        if qs is None:
+            qs = obj.accounts_that_copy_me.filter(status='active').order_by('name')
         return [
             {'id': a.id, 'name': a.name, 'status': a.status, 'account_type': a.account_type}
             for a in qs
@@ -84,6 +87,9 @@ class TradingAccountSerializer(serializers.ModelSerializer):
 
     def get_trades_count(self, obj):
         """Retourne le nombre de trades associés à ce compte."""
+        # Annoté par la liste de TradingAccountViewSet ; un seul compte sinon (détail, création)
+        if hasattr(obj, 'annotated_trades_count'):
+            return obj.annotated_trades_count
         return obj.imported_trades.count()
 
     def validate_copy_imports_from(self, leader):
@@ -171,7 +177,10 @@ class TradingAccountListSerializer(serializers.ModelSerializer):
         ]
 
     def get_accounts_copying_this_one(self, obj):
-        qs = obj.accounts_that_copy_me.filter(status='active').order_by('name')
+        # Préchargé (actifs, triés) par TradingAccountViewSet ; requête dédiée sinon
+        qs = getattr(obj, 'active_copying_accounts', None)
+        if qs is None:
+            qs = obj.accounts_that_copy_me.filter(status='active').order_by('name')
         return [
             {'id': a.id, 'name': a.name, 'status': a.status, 'account_type': a.account_type}
             for a in qs
@@ -179,6 +188,9 @@ class TradingAccountListSerializer(serializers.ModelSerializer):
 
     def get_trades_count(self, obj):
         """Retourne le nombre de trades associés à ce compte."""
+        # Annoté par la liste de TradingAccountViewSet ; un seul compte sinon (détail, création)
+        if hasattr(obj, 'annotated_trades_count'):
+            return obj.annotated_trades_count
         return obj.imported_trades.count()
 
 
@@ -588,9 +600,8 @@ class TradeStrategySerializer(serializers.ModelSerializer):
     
     def validate_dominant_emotions(self, value):
         """Valide que les émotions sélectionnées sont valides."""
-        valid_emotions = [choice[0] for choice in TradeStrategy.EMOTION_CHOICES]
         for emotion in value:
-            if emotion not in valid_emotions:
+            if emotion not in TradeStrategy.EMOTION_LABELS:
                 raise serializers.ValidationError(f"Émotion invalide: {emotion}")
         return value
     
@@ -663,9 +674,8 @@ class DayStrategyComplianceSerializer(serializers.ModelSerializer):
     
     def validate_dominant_emotions(self, value):
         """Valide que les émotions sélectionnées sont valides."""
-        valid_emotions = [choice[0] for choice in DayStrategyCompliance.EMOTION_CHOICES]
         for emotion in value:
-            if emotion not in valid_emotions:
+            if emotion not in DayStrategyCompliance.EMOTION_LABELS:
                 raise serializers.ValidationError(f"Émotion invalide: {emotion}")
         return value
     
@@ -694,6 +704,39 @@ class DayStrategyComplianceSerializer(serializers.ModelSerializer):
         return data
 
 
+def _validate_strategy_content(value):
+    """Valide la structure du contenu d'une stratégie (sections avec titre et liste de règles)."""
+    if not isinstance(value, dict):
+        raise serializers.ValidationError("Le contenu doit être un objet JSON valide")
+    
+    # Validation de la structure des sections
+    if 'sections' not in value:
+        raise serializers.ValidationError("Le contenu doit contenir une liste de sections")
+    
+    sections = value.get('sections', [])
+    if not isinstance(sections, list):
+        raise serializers.ValidationError("Les sections doivent être une liste")
+    
+    if len(sections) == 0:
+        raise serializers.ValidationError("Au moins une section est requise")
+    
+    # Validation de chaque section
+    for i, section in enumerate(sections):
+        if not isinstance(section, dict):
+            raise serializers.ValidationError(f"La section {i+1} doit être un objet")
+        
+        if 'title' not in section:
+            raise serializers.ValidationError(f"La section {i+1} doit avoir un titre")
+        
+        if 'rules' not in section:
+            raise serializers.ValidationError(f"La section {i+1} doit avoir des règles")
+        
+        if not isinstance(section['rules'], list):
+            raise serializers.ValidationError(f"Les règles de la section {i+1} doivent être une liste")
+    
+    return value
+
+
 class PositionStrategySerializer(serializers.ModelSerializer):
     """
     Serializer pour les stratégies de position avec gestion des versions.
@@ -772,35 +815,7 @@ class PositionStrategySerializer(serializers.ModelSerializer):
     
     def validate_strategy_content(self, value):
         """Valide le contenu de la stratégie."""
-        if not isinstance(value, dict):
-            raise serializers.ValidationError("Le contenu doit être un objet JSON valide")
-        
-        # Validation de la structure des sections
-        if 'sections' not in value:
-            raise serializers.ValidationError("Le contenu doit contenir une liste de sections")
-        
-        sections = value.get('sections', [])
-        if not isinstance(sections, list):
-            raise serializers.ValidationError("Les sections doivent être une liste")
-        
-        if len(sections) == 0:
-            raise serializers.ValidationError("Au moins une section est requise")
-        
-        # Validation de chaque section
-        for i, section in enumerate(sections):
-            if not isinstance(section, dict):
-                raise serializers.ValidationError(f"La section {i+1} doit être un objet")
-            
-            if 'title' not in section:
-                raise serializers.ValidationError(f"La section {i+1} doit avoir un titre")
-            
-            if 'rules' not in section:
-                raise serializers.ValidationError(f"La section {i+1} doit avoir des règles")
-            
-            if not isinstance(section['rules'], list):
-                raise serializers.ValidationError(f"Les règles de la section {i+1} doivent être une liste")
-        
-        return value
+        return _validate_strategy_content(value)
     
     def validate_status(self, value):
         """Valide le statut de la stratégie."""
@@ -874,35 +889,7 @@ class PositionStrategyCreateSerializer(serializers.ModelSerializer):
     
     def validate_strategy_content(self, value):
         """Valide le contenu de la stratégie."""
-        if not isinstance(value, dict):
-            raise serializers.ValidationError("Le contenu doit être un objet JSON valide")
-        
-        # Validation de la structure des sections
-        if 'sections' not in value:
-            raise serializers.ValidationError("Le contenu doit contenir une liste de sections")
-        
-        sections = value.get('sections', [])
-        if not isinstance(sections, list):
-            raise serializers.ValidationError("Les sections doivent être une liste")
-        
-        if len(sections) == 0:
-            raise serializers.ValidationError("Au moins une section est requise")
-        
-        # Validation de chaque section
-        for i, section in enumerate(sections):
-            if not isinstance(section, dict):
-                raise serializers.ValidationError(f"La section {i+1} doit être un objet")
-            
-            if 'title' not in section:
-                raise serializers.ValidationError(f"La section {i+1} doit avoir un titre")
-            
-            if 'rules' not in section:
-                raise serializers.ValidationError(f"La section {i+1} doit avoir des règles")
-            
-            if not isinstance(section['rules'], list):
-                raise serializers.ValidationError(f"Les règles de la section {i+1} doivent être une liste")
-        
-        return value
+        return _validate_strategy_content(value)
 
     def validate_example_screenshot(self, value):
         return _normalize_position_strategy_screenshot(value, self.context)
@@ -935,35 +922,7 @@ class PositionStrategyUpdateSerializer(serializers.ModelSerializer):
     
     def validate_strategy_content(self, value):
         """Valide le contenu de la stratégie."""
-        if not isinstance(value, dict):
-            raise serializers.ValidationError("Le contenu doit être un objet JSON valide")
-        
-        # Validation de la structure des sections
-        if 'sections' not in value:
-            raise serializers.ValidationError("Le contenu doit contenir une liste de sections")
-        
-        sections = value.get('sections', [])
-        if not isinstance(sections, list):
-            raise serializers.ValidationError("Les sections doivent être une liste")
-        
-        if len(sections) == 0:
-            raise serializers.ValidationError("Au moins une section est requise")
-        
-        # Validation de chaque section
-        for i, section in enumerate(sections):
-            if not isinstance(section, dict):
-                raise serializers.ValidationError(f"La section {i+1} doit être un objet")
-            
-            if 'title' not in section:
-                raise serializers.ValidationError(f"La section {i+1} doit avoir un titre")
-            
-            if 'rules' not in section:
-                raise serializers.ValidationError(f"La section {i+1} doit avoir des règles")
-            
-            if not isinstance(section['rules'], list):
-                raise serializers.ValidationError(f"Les règles de la section {i+1} doivent être une liste")
-        
-        return value
+        return _validate_strategy_content(value)
 
     def validate_example_screenshot(self, value):
         return _normalize_position_strategy_screenshot(value, self.context)
@@ -67,11 +67,14 @@ def compute_analytics_payload(request, trades, pf: str) -> Dict[str, Any]:
     fx_resolver = resolve_fx_pnl_resolver(request, trades)
     pnl_dec, pnl_flt = make_pnl_getters(fx_resolver, pf)
     pnl_float_fn = pnl_flt if fx_resolver else None
+    # Le queryset est parcouru plusieurs fois (tailles, journées, discipline) : compte joint
+    # pour la conversion FX et colonnes lourdes différées à chaque passe
+    trades = trades.select_related('trading_account').light()
     post_loss_sizing = compute_post_loss_sizing(trades, pf, pnl_float_fn=pnl_float_fn)
     post_win_sizing = compute_post_win_sizing(trades, pf, pnl_float_fn=pnl_float_fn)
     # Utiliser le timezone de l'utilisateur
     user_tz = get_user_timezone(request)
-    trades_list = list(trades.select_related('trading_account'))
+    trades_list = list(trades)
     # Agréger par jour
     daily_data = defaultdict(lambda: {'pnl': 0.0, 'trade_count': 0, 'trades': []})  # type: ignore
     for trade in trades_list:
@@ -180,7 +180,7 @@ def compute_dashboard_summary_payload(request, *, include_lists: bool = True) ->
 
     active_days_count = len(active_dates)
 
-    limited_trades = trades_queryset.select_related('trading_account')[:500]
+    limited_trades = trades_queryset.with_related().light()[:500]
     trades_data = ImportedTradeListSerializer(limited_trades, many=True).data if include_lists else []
 
     compliance_stats = None
@@ -250,7 +250,7 @@ def compute_dashboard_summary_payload(request, *, include_lists: bool = True) ->
         _dash_pf,
     )
 
-    recent_trades_qs = period_trades_qs.select_related('trading_account').order_by('-entered_at')[:20]
+    recent_trades_qs = period_trades_qs.with_related().light().order_by('-entered_at')[:20]
     recent_trades_data = ImportedTradeListSerializer(recent_trades_qs, many=True).data if include_lists else []
 
     balance_context = None
@@ -1,7 +1,7 @@
 """
 Services pour le calcul de progression des objectifs de trading.
 """
-from django.db.models import Avg, Exists, OuterRef, QuerySet, Sum
+from django.db.models import Avg, Count, Exists, OuterRef, Q, QuerySet, Sum
 from decimal import Decimal
 from typing import cast, TYPE_CHECKING
 
@@ -17,6 +17,38 @@ class GoalProgressCalculator:
     Service pour calculer la progression des objectifs de trading.
     """
 
+    # Types dont la valeur courante est une simple agrégation des trades (précalculable en lot)
+    BATCHABLE_GOAL_TYPES = ('pnl_total', 'trades_count')
+
+    def __init__(self) -> None:
+        self._prefetched_values: dict[int, Decimal] = {}
+
+    def prefetch_trade_aggregates(self, goals) -> None:
+        """
+        Précalcule les valeurs des objectifs PnL total / nombre de trades :
+        une requête d'agrégation conditionnelle par utilisateur au lieu d'une par objectif.
+        """
+        goals_by_user: dict[int, list[TradingGoal]] = {}
+        for goal in goals:
+            if goal.pk and goal.goal_type in self.BATCHABLE_GOAL_TYPES:
+                goals_by_user.setdefault(goal.user_id, []).append(goal)  # type: ignore
+
+        for user_id, user_goals in goals_by_user.items():
+            pf = self._pnl_field_for_goal(user_goals[0])
+            aggregates = {}
+            for goal in user_goals:
+                scope = Q(trade_day__gte=goal.start_date, trade_day__lte=goal.end_date)
+                if goal.trading_account_id:  # type: ignore
+                    scope &= Q(trading_account_id=goal.trading_account_id)  # type: ignore
+                if goal.goal_type == 'pnl_total':
+                    aggregates[f'goal_{goal.pk}'] = Sum(pf, filter=scope)
+                else:
+                    aggregates[f'goal_{goal.pk}'] = Count('id', filter=scope)
+
+            totals = ImportedTrade.objects.filter(user_id=user_id).aggregate(**aggregates)
+            for goal in user_goals:
+                self._prefetched_values[goal.pk] = self._to_decimal(totals[f'goal_{goal.pk}'])
+
     @staticmethod
     def _to_decimal(value) -> Decimal:
         """Convertit une valeur (DecimalField ou autre) en Decimal."""
@@ -127,8 +159,9 @@ class GoalProgressCalculator:
     def _calculate_pnl_goal(self, goal: TradingGoal, trades) -> dict:
         """Calcule la progression pour un objectif PnL total."""
         pf = self._pnl_field_for_goal(goal)
-        total_pnl = trades.aggregate(total=Sum(pf))['total'] or Decimal('0')
-        current_value = total_pnl
+        current_value = self._prefetched_values.get(goal.pk)
+        if current_value is None:
+            current_value = trades.aggregate(total=Sum(pf))['total'] or Decimal('0')
 
         target_value_decimal = self._get_target_value(goal)
         percentage_float = self._calculate_percentage(goal, current_value, target_value_decimal)
@@ -219,7 +252,9 @@ class GoalProgressCalculator:
 
     def _calculate_trades_count_goal(self, goal: TradingGoal, trades) -> dict:
         """Calcule la progression pour un objectif Nombre de Trades."""
-        current_value = Decimal(str(trades.count()))
+        current_value = self._prefetched_values.get(goal.pk)
+        if current_value is None:
+            current_value = Decimal(str(trades.count()))
 
         target_value_decimal = self._get_target_value(goal)
         percentage_float = self._calculate_percentage(goal, current_value, target_value_decimal)
@@ -68,8 +68,8 @@ class AccountMetricsCalculator:
         account_balance_high = initial_capital
         running_balance = initial_capital
         
-        for trade in trades:
-            trade_pnl = self._to_decimal(trade.net_pnl) if trade.net_pnl else Decimal('0')
+        for net_pnl in trades.values_list('net_pnl', flat=True):
+            trade_pnl = self._to_decimal(net_pnl) if net_pnl else Decimal('0')
             running_balance += trade_pnl
             # Mettre à jour le maximum si le solde actuel est plus élevé
             if running_balance > account_balance_high:
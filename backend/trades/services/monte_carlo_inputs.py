@@ -4,7 +4,7 @@ from __future__ import annotations
 import statistics
 from typing import Any
 
-from trades.contract_utils.contract_family import trade_risk_units
+from trades.contract_utils.contract_family import risk_units_from_values
 
 
 def compute_monte_carlo_exposure_inputs(trades_queryset) -> dict[str, Any]:
@@ -16,9 +16,11 @@ def compute_monte_carlo_exposure_inputs(trades_queryset) -> dict[str, Any]:
     skipped_unknown_contract = 0
     trade_count = 0
 
-    for trade in trades_queryset.iterator():
+    # Trois colonnes par ligne, sans instancier de modèle ; lecture par lots bornés
+    rows = trades_queryset.values_list('size', 'contract_name', 'point_value')
+    for size, contract_name, point_value in rows.iterator(chunk_size=2000):
         trade_count += 1
-        risk = trade_risk_units(trade)
+        risk = risk_units_from_values(size, contract_name, point_value)
         if risk is None:
             skipped_unknown_contract += 1
             continue
@@ -307,7 +307,10 @@ def rebuild_rollups_for_user(user_id: int) -> int:
     """Recalcule tous les rollups d'un utilisateur. Retourne le nombre de lignes créées."""
     TradeDailyRollup.objects.filter(user_id=user_id).delete()
 
-    trades = ImportedTrade.objects.filter(user_id=user_id).select_related('user', 'trading_account')
+    # Seuls les champs lus par buckets_for_trade : ni raw_data (JSON) ni textes libres par ligne
+    trades = ImportedTrade.objects.filter(user_id=user_id).select_related('user').only(
+        'user', 'trading_account_id', 'trade_day', 'entered_at', 'position_strategy_id'
+    )
     buckets: Set[RollupBucket] = set()
 
     for trade in trades.iterator(chunk_size=500):
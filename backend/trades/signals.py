@@ -303,6 +303,37 @@ def refresh_balance_cache_after_trade_delete(sender, instance, **kwargs):
         _refresh_balance_cache_for_account(instance.trading_account_id)
 
 
+def handle_trades_bulk_created(trading_account, trades) -> None:
+    """
+    Équivalent des receivers post_save ImportedTrade pour un lot créé via bulk_create
+    (qui n'émet pas de signaux) : rollups, stats, MLL et cache solde une seule fois.
+    """
+    if not trading_account or not trades:
+        return
+    user_id = trading_account.user_id
+    try:
+        from .services.rollup_service import buckets_for_trade
+        from .tasks import schedule_debounced_rollup_rebuild
+
+        buckets = set()
+        for trade in trades:
+            buckets.update(buckets_for_trade(trade))
+        schedule_debounced_rollup_rebuild(user_id, buckets)
+        _invalidate_stats_after_trade_mutation(user_id)
+    except Exception as e:
+        logger.error('Erreur rollup après import en masse (compte %s): %s', trading_account.id, e)
+
+    trade_days = [t.trade_day for t in trades if t.trade_day]
+    # Comptes TopStep recalculés quel que soit mll_enabled, comme l'ancien recalcul de fin d'import
+    if (trading_account.mll_enabled or trading_account.is_topstep) and trade_days:
+        try:
+            AccountMetricsCalculator().recalculate_metrics_from_date(trading_account, min(trade_days))
+        except Exception as e:
+            logger.error(f"Erreur lors du recalcul des métriques après import en masse pour le compte {trading_account.id}: {e}")
+
+    _refresh_balance_cache_for_account(trading_account.id)
+
+
 @receiver(post_save, sender=AccountTransaction)
 def refresh_balance_cache_after_transaction_save(sender, instance, **kwargs):
     if instance.trading_account_id:
@@ -127,6 +127,7 @@ class TopStepXSyncService:
 
         parsed_rows = map_api_trades_to_parsed_rows(api_trades)
         counts = import_parsed_trades(user, trading_account, parsed_rows)
+        errors.extend(counts['errors'])
 
         from trades.replay.auto_build import build_replay_for_new_trade_days
 
@@ -7,7 +7,8 @@ from decimal import Decimal
 from django.db import transaction
 
 from trades.models import ImportedTrade
-from trades.utils import _recalculate_mll_for_topstep_accounts
+
+BULK_CREATE_BATCH_SIZE = 1000
 
 
 def trade_exists(user, trading_account, external_trade_id: str) -> bool:
@@ -18,6 +19,31 @@ def trade_exists(user, trading_account, external_trade_id: str) -> bool:
     ).exists()
 
 
+def existing_external_ids(user, trading_account, external_trade_ids) -> set[str]:
+    """Ids broker déjà présents pour ce compte (une seule requête IN)."""
+    return set(
+        ImportedTrade.objects.filter(
+            user=user,
+            trading_account=trading_account,
+            external_trade_id__in=list(external_trade_ids),
+        ).values_list('external_trade_id', flat=True)
+    )
+
+
+def invalid_trade_reason(parsed: dict) -> str | None:
+    """
+    Même contrôle que TopStepCSVImporter._parse_row : prix d'entrée et taille strictement
+    positifs (contraintes CHECK en base). Retourne le motif du rejet, None si la ligne est valide.
+    """
+    entry_price = parsed.get('entry_price')
+    if not entry_price or entry_price <= 0:
+        return f"Prix d'entrée invalide: {entry_price}"
+    size = parsed.get('size')
+    if not size or size <= 0:
+        return f"Taille invalide: {size}"
+    return None
+
+
 def create_trade_from_parsed(user, trading_account, parsed: dict) -> ImportedTrade | None:
     """Crée un trade si external_trade_id absent. Ne met jamais à jour un trade existant."""
     external_trade_id = parsed['external_trade_id']
@@ -44,24 +70,80 @@ def create_trade_from_parsed(user, trading_account, parsed: dict) -> ImportedTra
     )
 
 
+def bulk_create_trades_from_parsed(user, trading_account, parsed_rows: list[dict]) -> list[ImportedTrade]:
+    """
+    Variante en masse de create_trade_from_parsed pour les imports CSV.
+
+    Les doublons (déjà en base ou répétés dans le fichier) sont ignorés ; les champs
+    dérivés sont calculés en une passe par ImportedTrade.bulk_compute puis les trades
+    sont insérés par lots. bulk_create ne déclenche pas post_save : les effets de bord
+    des signaux sont appliqués une fois pour le lot via handle_trades_bulk_created.
+    """
+    import pandas as pd
+
+    from trades.signals import handle_trades_bulk_created
+
+    existing = existing_external_ids(user, trading_account, (p['external_trade_id'] for p in parsed_rows))
+    rows = []
+    for parsed in parsed_rows:
+        external_trade_id = parsed['external_trade_id']
+        if external_trade_id in existing:
+            continue
+        existing.add(external_trade_id)
+        rows.append({
+            'external_trade_id': external_trade_id,
+            'contract_name': parsed['contract_name'],
+            'entered_at': parsed['entered_at'],
+            'exited_at': parsed.get('exited_at'),
+            'entry_price': parsed['entry_price'],
+            'exit_price': parsed.get('exit_price'),
+            'fees': parsed.get('fees') or Decimal('0'),
+            'size': parsed['size'],
+            'trade_type': parsed['trade_type'],
+            'trade_duration': parsed.get('trade_duration'),
+            'commissions': parsed.get('commissions') or Decimal('0'),
+            'point_value': parsed.get('point_value'),
+            'pnl': parsed.get('pnl'),
+            'raw_data': parsed.get('raw_data'),
+            'source_import': parsed.get('source_import'),
+            'source_line_no': parsed.get('source_line_no'),
+        })
+    if not rows:
+        return []
+
+    computed = ImportedTrade.bulk_compute(pd.DataFrame(rows, dtype=object))
+    trades = [
+        ImportedTrade(user=user, trading_account=trading_account, **record)
+        for record in computed.to_dict('records')
+    ]
+    created = ImportedTrade.objects.bulk_create(trades, batch_size=BULK_CREATE_BATCH_SIZE)
+    handle_trades_bulk_created(trading_account, created)
+    return created
+
+
 @transaction.atomic
 def import_parsed_trades(user, trading_account, parsed_rows: list[dict]) -> dict:
-    created = 0
-    skipped = 0
-    created_trade_days: set[date] = set()
+    """
+    Import API : même chemin en masse que le CSV (dédoublonnage IN, bulk_create, effets groupés).
+    Les lignes invalides (prix d'entrée ou taille non positifs) sont écartées avant bulk_create
+    et comptées à part : une seule d'entre elles ferait échouer tout le lot sur les CHECK.
+    """
+    errors: list[str] = []
+    valid_rows = []
     for parsed in parsed_rows:
-        trade = create_trade_from_parsed(user, trading_account, parsed)
-        if trade:
-            created += 1
-            trade_day = trade.trade_day or parsed.get('trade_day')
-            if trade_day:
-                created_trade_days.add(trade_day)
-        else:
-            skipped += 1
-    if created:
-        _recalculate_mll_for_topstep_accounts([trading_account])
+        reason = invalid_trade_reason(parsed)
+        if reason:
+            errors.append(f"{reason} (trade {parsed.get('external_trade_id')})")
+            continue
+        valid_rows.append(parsed)
+
+    created_trades = bulk_create_trades_from_parsed(user, trading_account, valid_rows)
+    # MLL déjà recalculé depuis le premier jour importé par handle_trades_bulk_created
+    created_trade_days: set[date] = {trade.trade_day for trade in created_trades if trade.trade_day}
     return {
-        'created': created,
-        'skipped': skipped,
+        'created': len(created_trades),
+        'skipped': len(valid_rows) - len(created_trades),
+        'invalid': len(errors),
+        'errors': errors,
         'created_trade_days': created_trade_days,
     }
@@ -167,3 +167,40 @@ def warm_stats_cache_for_user(self, user_id: int) -> None:
             logger.warning('Warm stats-bundle preset failed user=%s: %s', user_id, exc)
 
     logger.info('Stats cache warmed for user=%s (%s presets)', user_id, warmed)
+
+
+GOAL_ALERT_KINDS = ('achieved', 'danger')
+
+
+def schedule_goal_alert_email(goal_id: int, kind: str) -> None:
+    """
+    Envoie l'email d'alerte d'objectif après le commit, hors du cycle requête.
+    Repli synchrone si le broker est indisponible (l'alerte est déjà horodatée en base).
+    """
+    from django.db import transaction
+
+    def enqueue() -> None:
+        try:
+            send_goal_alert_email.delay(goal_id, kind)
+        except Exception as exc:
+            logger.warning('Unable to enqueue goal alert %s for goal %s, sending inline: %s', kind, goal_id, exc)
+            send_goal_alert_email.run(goal_id, kind)
+
+    transaction.on_commit(enqueue)
+
+
+# Sans retry : send_goal_*_email interceptent déjà les erreurs SMTP et retournent False
+@shared_task
+def send_goal_alert_email(goal_id: int, kind: str) -> None:
+    from trades.goal_alerts import send_goal_achieved_email, send_goal_danger_email
+    from trades.models import TradingGoal
+
+    if kind not in GOAL_ALERT_KINDS:
+        return
+    goal = TradingGoal.objects.select_related('user', 'trading_account').filter(pk=goal_id).first()
+    if goal is None:
+        return
+    if kind == 'achieved':
+        send_goal_achieved_email(goal)
+    else:
+        send_goal_danger_email(goal)
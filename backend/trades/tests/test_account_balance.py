@@ -3,6 +3,7 @@ from decimal import Decimal
 
 from datetime import date, datetime, timedelta
 
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 from django.utils import timezone
 from rest_framework.test import APITestCase, APIClient, APIRequestFactory
@@ -471,3 +472,15 @@ class WithdrawalValidationTests(TestCase):
             context={'request': self._request()},
         )
         self.assertFalse(ser2.is_valid())
+
+    def test_non_positive_amount_rejected_by_database(self) -> None:
+        txn = AccountTransaction.objects.create(
+            user=self.user,
+            trading_account=self.account,
+            transaction_type='deposit',
+            amount=Decimal('10.00'),
+            transaction_date=timezone.now(),
+        )
+        # update() contourne le MinValueValidator : c'est la contrainte CHECK qui refuse
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            AccountTransaction.objects.filter(pk=txn.pk).update(amount=Decimal('0'))
@@ -170,3 +170,29 @@ class BehaviorDisciplineServiceTests(APITestCase):
         bd = response.data['behavior_discipline']
         self.assertFalse(bd['revenge_trading']['has_sufficient_data'])
         self.assertFalse(bd['sizing_discipline']['has_sufficient_data'])
+
+    def test_analytics_payload_query_count_independent_of_trade_count(self) -> None:
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory, force_authenticate
+
+        from trades.services.analytics_calculator import compute_analytics_payload
+
+        def count_queries() -> int:
+            http_request = APIRequestFactory().get('/api/trades/imported/analytics/')
+            force_authenticate(http_request, user=self.user)
+            request = Request(http_request)
+            request.user = self.user
+            qs = ImportedTrade.objects.filter(trading_account=self.account)
+            with CaptureQueriesContext(connection) as ctx:
+                compute_analytics_payload(request, qs, self.pnl_field)
+            return len(ctx.captured_queries)
+
+        self._create_trade('q1', 0, '1', '10')
+        self._create_trade('q2', 10, '2', '-10')
+        count_queries()  # préférences utilisateur mises en cache
+        small = count_queries()
+        for i in range(6):
+            self._create_trade(f'q{i + 3}', 20 + i * 10, '1', '5' if i % 2 else '-5')
+        self.assertEqual(count_queries(), small)
@@ -302,6 +302,53 @@ class ComplianceStreakTests(TestCase):
         self.assertEqual(ctx_twelve_months['current_streak'], 3)
 
 
+    def test_strategies_queryset_serializes_without_per_row_queries(self):
+        """Le dashboard sérialise strategies_queryset : trade et user doivent être joints."""
+        from datetime import datetime, timedelta
+
+        from trades.models import ImportedTrade, TradeStrategy
+        from trades.serializers import TradeStrategySerializer
+
+        for i in range(3):
+            day = date(2026, 6, 10 + i)
+            entered = datetime.combine(day, datetime.min.time().replace(hour=10))
+            trade = ImportedTrade.objects.create(
+                user=self.user,
+                trading_account=self.account,
+                external_trade_id=f'SER-{i}',
+                contract_name='ES',
+                trade_type='Long',
+                entered_at=entered,
+                exited_at=entered + timedelta(hours=1),
+                entry_price=Decimal('100.000000000'),
+                exit_price=Decimal('101.000000000'),
+                size=Decimal('1.0000'),
+                trade_day=day,
+                net_pnl=Decimal('50'),
+                pnl=Decimal('50'),
+            )
+            TradeStrategy.objects.create(
+                user=self.user,
+                trade=trade,
+                strategy_respected=True,
+                tp1_reached=False,
+                tp2_plus_reached=False,
+            )
+
+        ctx = compute_strategy_compliance_context(
+            self.user,
+            trading_account_id=self.account.id,
+            position_strategy_id=None,
+            start_date='2026-06-01',
+            end_date='2026-06-30',
+        )
+        # Queryset déjà évalué par le calcul des séries : la sérialisation ne doit rien requêter
+        with self.assertNumQueries(0):
+            data = TradeStrategySerializer(ctx['strategies_queryset'], many=True).data
+        self.assertEqual(len(data), 3)
+        self.assertEqual({row['user_username'] for row in data}, {'streak_user'})
+        self.assertEqual(sorted(row['trade_info']['external_trade_id'] for row in data), ['SER-0', 'SER-1', 'SER-2'])
+
 class DisciplineBadgeMilestoneTests(SimpleTestCase):
     def test_next_badge_at_20_targets_maltz(self):
         from trades.compliance_streaks import compute_dashboard_next_badge
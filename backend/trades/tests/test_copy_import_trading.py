@@ -1,12 +1,13 @@
 """Tests copy trading : même external_trade_id sur deux comptes, serializer, importeur."""
 from datetime import datetime
 from decimal import Decimal
+from unittest.mock import patch
 from zoneinfo import ZoneInfo
 
 from django.test import TestCase
 
 from accounts.models import User
-from trades.models import ImportedTrade, TradingAccount
+from trades.models import AccountDailyMetrics, ImportedTrade, TradingAccount
 from trades.serializers import TradingAccountSerializer
 from trades.utils import TopStepCSVImporter
 
@@ -100,6 +101,153 @@ class CopyImportSameTopstepIdTwoAccountsTests(TestCase):
         self.assertEqual(ImportedTrade.objects.filter(external_trade_id='import-dup-2').count(), 1)
 
 
+class BulkImportMatchesSaveTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            email='bulk-import@example.com',
+            username='bulk_import_user',
+            password='testpass123',
+        )
+        self.account = TradingAccount.objects.create(
+            user=self.user, name='Bulk', account_type='topstep', currency='USD', status='active'
+        )
+
+    def test_bulk_import_derived_fields_match_save(self) -> None:
+        csv_content = MINIMAL_CSV_HEADER + _csv_line('bulk-1') + _csv_line('bulk-1') + _csv_line('bulk-2')
+        importer = TopStepCSVImporter(self.user, target_accounts=[self.account])
+        result = importer.import_from_string(csv_content, 't.csv', dry_run=False)
+        self.assertTrue(result['success'])
+        self.assertEqual(result['success_count'], 2)
+        self.assertEqual(result['skipped_count'], 1)
+
+        imported = ImportedTrade.objects.get(trading_account=self.account, external_trade_id='bulk-1')
+        self.assertIsNone(imported.raw_data)
+        self.assertEqual(imported.source_line_no, 2)
+        self.assertEqual(imported.get_raw_data()['Id'], 'bulk-1')
+        reference = ImportedTrade(
+            user=self.user,
+            trading_account=self.account,
+            external_trade_id='ref-1',
+            contract_name=imported.contract_name,
+            entered_at=imported.entered_at,
+            exited_at=imported.exited_at,
+            entry_price=imported.entry_price,
+            exit_price=imported.exit_price,
+            fees=imported.fees,
+            size=imported.size,
+            trade_type=imported.trade_type,
+            commissions=imported.commissions,
+            point_value=imported.point_value,
+        )
+        reference.save()
+        reference.refresh_from_db()
+        for field in ('pnl', 'net_pnl', 'pnl_percentage', 'trade_duration', 'trade_day'):
+            self.assertEqual(getattr(imported, field), getattr(reference, field), field)
+
+        again = TopStepCSVImporter(self.user, target_accounts=[self.account])
+        result = again.import_from_string(csv_content, 't.csv', dry_run=False)
+        self.assertEqual(result['success_count'], 0)
+        self.assertEqual(result['skipped_count'], 3)
+
+    def test_import_computes_mll_metrics_for_imported_days(self) -> None:
+        self.account.maximum_loss_limit = Decimal('2000')
+        self.account.mll_enabled = True
+        self.account.save(update_fields=['maximum_loss_limit', 'mll_enabled'])
+        importer = TopStepCSVImporter(self.user, target_accounts=[self.account])
+        result = importer.import_from_string(MINIMAL_CSV_HEADER + _csv_line('mll-1'), 't.csv', dry_run=False)
+        self.assertEqual(result['success_count'], 1)
+        trade = ImportedTrade.objects.get(external_trade_id='mll-1')
+        self.assertTrue(
+            AccountDailyMetrics.objects.filter(trading_account=self.account, date=trade.trade_day).exists()
+        )
+
+    def test_import_recalculates_topstep_account_with_mll_disabled(self) -> None:
+        self.account.mll_enabled = False
+        self.account.save(update_fields=['mll_enabled'])
+        importer = TopStepCSVImporter(self.user, target_accounts=[self.account])
+        with patch(
+            'trades.services.AccountMetricsCalculator.recalculate_metrics_from_date'
+        ) as recalculate:
+            result = importer.import_from_string(MINIMAL_CSV_HEADER + _csv_line('mll-off-1'), 't.csv', dry_run=False)
+        self.assertEqual(result['success_count'], 1)
+        trade = ImportedTrade.objects.get(external_trade_id='mll-off-1')
+        recalculate.assert_called_once_with(self.account, trade.trade_day)
+
+    def test_archived_row_survives_quoted_multiline_field(self) -> None:
+        header = MINIMAL_CSV_HEADER.rstrip('\n') + ',Note\n'
+        csv_content = (
+            header
+            + _csv_line('multi-1').rstrip('\n') + ',"ligne 1\nligne 2"\n'
+            + _csv_line('multi-2').rstrip('\n') + ',simple\n'
+        )
+        importer = TopStepCSVImporter(self.user, target_accounts=[self.account])
+        result = importer.import_from_string(csv_content, 't.csv', dry_run=False)
+        self.assertEqual(result['success_count'], 2)
+
+        second = ImportedTrade.objects.select_related('source_import').get(external_trade_id='multi-2')
+        self.assertEqual(second.source_line_no, 3)
+        log = second.source_import
+        self.assertEqual(second.get_raw_data()['Note'], 'simple')
+        self.assertEqual(log.get_row(2)['Note'], 'ligne 1\nligne 2')
+        self.assertIsNone(log.get_row(4))
+
+    def test_vectorized_dates_match_row_parser_and_keep_row_errors(self) -> None:
+        values = ['10/08/2025 18:23:28 +02:00', '1/2/2025 01:02:03 -05:30', '', 'pas une date']
+        self.assertEqual(
+            ImportedTrade.parse_us_datetimes(values)[:2],
+            [ImportedTrade.parse_us_datetime(v) for v in values[:2]],
+        )
+
+        bad_line = _csv_line('bulk-bad').replace('10/08/2025 18:23:28 +02:00', 'pas une date', 1)
+        importer = TopStepCSVImporter(self.user, target_accounts=[self.account])
+        result = importer.import_from_string(MINIMAL_CSV_HEADER + _csv_line('bulk-ok') + bad_line, 't.csv')
+        self.assertEqual(result['success_count'], 1)
+        self.assertEqual(result['error_count'], 1)
+        self.assertEqual(importer.errors[0]['row'], 3)
+        self.assertIn('pas une date', importer.errors[0]['error'])
+
+    def test_dry_run_matches_import_counts_without_per_row_queries(self) -> None:
+        TopStepCSVImporter(self.user, target_accounts=[self.account]).import_from_string(
+            MINIMAL_CSV_HEADER + _csv_line('dry-0'), 't.csv', dry_run=False
+        )
+        lines = [_csv_line('dry-0'), _csv_line('dry-1'), _csv_line('dry-1')]
+        lines += [_csv_line(f'dry-{n}') for n in range(2, 12)]
+        importer = TopStepCSVImporter(self.user, target_accounts=[self.account])
+        with self.assertNumQueries(1):
+            preview = importer.import_from_string(MINIMAL_CSV_HEADER + ''.join(lines), 't.csv', dry_run=True)
+        self.assertEqual(preview['total_rows'], 13)
+        self.assertEqual(preview['success_count'], 11)
+        self.assertEqual(preview['skipped_count'], 2)
+        self.assertEqual(ImportedTrade.objects.filter(trading_account=self.account).count(), 1)
+
+        result = TopStepCSVImporter(self.user, target_accounts=[self.account]).import_from_string(
+            MINIMAL_CSV_HEADER + ''.join(lines), 't.csv', dry_run=False
+        )
+        self.assertEqual(result['success_count'], preview['success_count'])
+        self.assertEqual(result['skipped_count'], preview['skipped_count'])
+
+    def test_parse_us_datetime_iso_fast_path(self) -> None:
+        utc = ZoneInfo('UTC')
+        self.assertEqual(
+            ImportedTrade.parse_us_datetime('10/08/2025 18:23:28 +02:00'),
+            datetime(2025, 10, 8, 16, 23, 28, tzinfo=utc),
+        )
+        # Mois / jour sans zéro : repli strptime
+        self.assertEqual(
+            ImportedTrade.parse_us_datetime('1/2/2025 01:02:03 -05:30'),
+            datetime(2025, 1, 2, 6, 32, 3, tzinfo=utc),
+        )
+        with self.assertRaises(ValueError):
+            ImportedTrade.parse_us_datetime('02/30/2025 01:02:03 +00:00')
+
+    def test_parse_us_decimal_blank_and_padded(self) -> None:
+        self.assertEqual(ImportedTrade.parse_us_decimal(' 25261.750000000 '), Decimal('25261.750000000'))
+        self.assertIsNone(ImportedTrade.parse_us_decimal(''))
+        self.assertIsNone(ImportedTrade.parse_us_decimal('   '))
+        with self.assertRaises(ValueError):
+            ImportedTrade.parse_us_decimal('1,5')
+
+
 class TradingAccountCopyImportsValidationTests(TestCase):
     def setUp(self) -> None:
         self.user = User.objects.create_user(
@@ -0,0 +1,113 @@
+"""Compte / template d'export par défaut : un seul par utilisateur (save() et bulk_set_default)."""
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+
+from accounts.models import User
+from trades.models import ExportTemplate, TradingAccount
+
+
+class DefaultTradingAccountTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            email='default-account@example.com',
+            username='default_account',
+            password='testpass123',
+        )
+        self.a = TradingAccount.objects.create(
+            user=self.user, name='A', account_type='other', currency='USD', status='active', is_default=True
+        )
+        self.b = TradingAccount.objects.create(
+            user=self.user, name='B', account_type='other', currency='USD', status='active'
+        )
+        self.c = TradingAccount.objects.create(
+            user=self.user, name='C', account_type='other', currency='USD', status='active'
+        )
+
+    def _defaults(self):
+        return list(
+            TradingAccount.objects.filter(user=self.user, is_default=True).values_list('name', flat=True)
+        )
+
+    def test_save_demotes_previous_default(self) -> None:
+        self.b.is_default = True
+        self.b.save()
+        self.assertEqual(self._defaults(), ['B'])
+
+    def test_bulk_set_default_uses_constant_queries(self) -> None:
+        with self.assertNumQueries(5):
+            # SAVEPOINT, verrou, rétrogradation, promotion, RELEASE
+            TradingAccount.bulk_set_default(self.user, self.c.pk)
+        self.assertEqual(self._defaults(), ['C'])
+
+    def test_bulk_set_default_is_idempotent(self) -> None:
+        TradingAccount.bulk_set_default(self.user, self.a.pk)
+        self.assertEqual(self._defaults(), ['A'])
+
+    def test_resaving_loaded_default_does_not_read_previous_state(self) -> None:
+        account = TradingAccount.objects.get(pk=self.a.pk)
+        account.name = 'A renamed'
+        with self.assertNumQueries(2):
+            # rétrogradation filtrée (aucune ligne), UPDATE du compte : pas de SELECT
+            account.save()
+        self.assertEqual(self._defaults(), ['A renamed'])
+
+    def test_saving_stale_default_demotes_newer_default(self) -> None:
+        stale = TradingAccount.objects.get(pk=self.a.pk)
+        TradingAccount.bulk_set_default(self.user, self.b.pk)
+        stale.name = 'A stale'
+        stale.save()
+        self.assertEqual(self._defaults(), ['A stale'])
+
+    def test_loading_without_is_default_does_not_query(self) -> None:
+        with self.assertNumQueries(1):
+            accounts = list(TradingAccount.objects.filter(user=self.user).only('id', 'name'))
+        self.assertTrue(all('is_default' in a.get_deferred_fields() for a in accounts))
+
+    def test_set_default_view_refreshes_instance(self) -> None:
+        from rest_framework.test import APIRequestFactory, force_authenticate
+
+        from trades.views import TradingAccountViewSet
+
+        view = TradingAccountViewSet.as_view({'post': 'set_default'})
+        request = APIRequestFactory().post(f'/api/trades/trading-accounts/{self.b.pk}/set_default/')
+        force_authenticate(request, user=self.user)
+        response = view(request, pk=self.b.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['is_default'])
+        self.assertEqual(self._defaults(), ['B'])
+
+
+class DefaultExportTemplateTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            email='default-template@example.com',
+            username='default_template',
+            password='testpass123',
+        )
+        self.pdf = ExportTemplate.objects.create(user=self.user, name='PDF', format='pdf', is_default=True)
+        self.other = ExportTemplate.objects.create(user=self.user, name='Autre', format='pdf')
+
+    def test_save_demotes_previous_default_of_same_format(self) -> None:
+        self.other.is_default = True
+        self.other.save()
+        self.pdf.refresh_from_db()
+        self.assertFalse(self.pdf.is_default)
+
+    def test_resaving_default_does_not_read_previous_state(self) -> None:
+        self.pdf.name = 'PDF renommé'
+        with self.assertNumQueries(2):
+            # rétrogradation filtrée (aucune ligne), UPDATE du template : pas de SELECT
+            self.pdf.save()
+        self.pdf.refresh_from_db()
+        self.assertTrue(self.pdf.is_default)
+
+    def test_saving_stale_default_demotes_newer_default(self) -> None:
+        ExportTemplate.objects.filter(pk=self.pdf.pk).update(is_default=False)
+        ExportTemplate.objects.filter(pk=self.other.pk).update(is_default=True)
+        self.pdf.save()  # instance chargée quand elle était le défaut
+        self.other.refresh_from_db()
+        self.assertFalse(self.other.is_default)
+
+    def test_one_default_per_format_enforced(self) -> None:
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ExportTemplate.objects.filter(pk=self.other.pk).update(is_default=True)
@@ -0,0 +1,154 @@
+"""Tests de la mise à jour de progression des objectifs de trading."""
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from trades.models import TradingAccount, TradingGoal
+
+User = get_user_model()
+
+
+class TradingGoalUpdateProgressTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='goal_progress_user',
+            email='goal_progress@example.com',
+            password='testpass123',
+        )
+        today = timezone.now().date()
+        self.goal = TradingGoal.objects.create(
+            user=self.user,
+            goal_type='pnl_total',
+            direction='minimum',
+            period_type='custom',
+            threshold_target=Decimal('1000'),
+            target_value=Decimal('1000'),
+            current_value=Decimal('100'),
+            start_date=today - timedelta(days=30),
+            end_date=today + timedelta(days=30),
+            status='active',
+        )
+
+    def _progress(self, current_value, status='active'):
+        return patch(
+            'trades.services.GoalProgressCalculator.calculate_progress',
+            return_value={'current_value': current_value, 'status': status},
+        )
+
+    def test_unchanged_progress_skips_update(self):
+        with self._progress(Decimal('100')), self.assertNumQueries(0):
+            self.goal.update_progress()
+
+    def test_changed_value_updates_only_current_value(self):
+        with self._progress(Decimal('250')), patch.object(TradingGoal, 'save') as save:
+            self.goal.update_progress()
+
+        save.assert_called_once_with(update_fields=['current_value', 'updated_at'])
+
+    def test_bulk_update_progress_writes_changed_goals(self):
+        count_goal = TradingGoal.objects.create(
+            user=self.user,
+            goal_type='trades_count',
+            direction='minimum',
+            period_type='custom',
+            threshold_target=Decimal('10'),
+            current_value=Decimal('3'),
+            start_date=self.goal.start_date,
+            end_date=self.goal.end_date,
+            status='active',
+        )
+        goals = list(TradingGoal.objects.filter(user=self.user).select_related('user', 'trading_account'))
+
+        updated = TradingGoal.bulk_update_progress(goals)
+
+        self.assertEqual(updated, 2)
+        self.assertEqual(
+            set(TradingGoal.objects.filter(user=self.user).values_list('current_value', flat=True)),
+            {Decimal('0')},
+        )
+
+    def test_danger_alert_sent_for_active_goal_near_deadline(self):
+        self.goal.end_date = timezone.now().date() + timedelta(days=3)
+        self.goal.save(update_fields=['end_date'])
+
+        with self._progress(Decimal('100')), patch('trades.tasks.send_goal_alert_email.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.goal.update_progress()
+                # Envoi différé au commit de la transaction
+                delay.assert_not_called()
+
+        delay.assert_called_once_with(self.goal.pk, 'danger')
+        self.goal.refresh_from_db()
+        self.assertIsNotNone(self.goal.last_danger_alert_sent)
+
+    def test_bulk_update_progress_sends_danger_alerts_once(self):
+        self.goal.end_date = timezone.now().date() + timedelta(days=3)
+        self.goal.save(update_fields=['end_date'])
+        goals = TradingGoal.objects.filter(user=self.user)
+
+        with patch('trades.tasks.schedule_goal_alert_email') as schedule:
+            TradingGoal.bulk_update_progress(goals)
+            TradingGoal.bulk_update_progress(goals)
+
+        schedule.assert_called_once_with(self.goal.pk, 'danger')
+        self.goal.refresh_from_db()
+        self.assertIsNotNone(self.goal.last_danger_alert_sent)
+        self.assertFalse(TradingGoal.objects.filter(pk=self.goal.pk).in_danger().exists())
+
+    def test_alert_task_sends_email_for_goal(self):
+        from trades.tasks import send_goal_alert_email
+
+        with patch('trades.goal_alerts.send_goal_achieved_email') as send:
+            send_goal_alert_email.run(self.goal.pk, 'achieved')
+
+        send.assert_called_once_with(self.goal)
+
+
+class TradingGoalWithProgressTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='goal_annotation_user',
+            email='goal_annotation@example.com',
+            password='testpass123',
+        )
+        today = timezone.now().date()
+        self.defaults = {
+            'user': self.user,
+            'goal_type': 'pnl_total',
+            'period_type': 'custom',
+            'start_date': today - timedelta(days=30),
+            'end_date': today + timedelta(days=30),
+        }
+
+    def test_annotation_matches_property(self):
+        cases = [
+            ('minimum', Decimal('1000'), None, Decimal('250')),
+            ('minimum', Decimal('200'), None, Decimal('500')),
+            ('minimum', Decimal('0'), None, Decimal('10')),
+            ('maximum', Decimal('500'), None, Decimal('100')),
+            ('maximum', Decimal('500'), None, Decimal('800')),
+        ]
+        for direction, threshold, target, current in cases:
+            TradingGoal.objects.create(
+                direction=direction, threshold_target=threshold, target_value=target,
+                current_value=current, **self.defaults,
+            )
+
+        for goal in TradingGoal.objects.filter(user=self.user).with_progress():
+            expected = TradingGoal.objects.get(pk=goal.pk).progress_percentage
+            self.assertAlmostEqual(goal.progress_percentage, expected, places=6)
+
+    def test_with_account_renders_str_without_extra_queries(self):
+        account = TradingAccount.objects.create(user=self.user, name='Compte principal')
+        TradingGoal.objects.create(
+            direction='minimum', threshold_target=Decimal('100'), trading_account=account, **self.defaults,
+        )
+
+        with self.assertNumQueries(1):
+            labels = [str(goal) for goal in TradingGoal.objects.filter(user=self.user).with_account()]
+
+        self.assertEqual(labels, ['PnL Total - Compte principal (Personnalisé)'])
@@ -1,6 +1,8 @@
 """Tests des dates de version pour PositionStrategy."""
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
 
 from trades.models import PositionStrategy
 
@@ -36,3 +38,103 @@ class PositionStrategyVersionPublishedAtTests(TestCase):
         self.assertIsNotNone(new_version.version_published_at)
         self.assertNotEqual(new_version.version_published_at, first_published)
         self.assertEqual(new_version.version, 2)
+
+    def test_version_numbers_follow_group_max_after_deletion(self):
+        v2 = self.strategy.create_new_version(new_content={}, version_notes='v2')
+        v3 = v2.create_new_version(new_content={}, version_notes='v3')
+        v3.delete()
+        v4 = v2.create_new_version(new_content={}, version_notes='v4')
+
+        self.assertEqual(v4.version, 3)
+        self.assertEqual(v4.parent_strategy_id, self.strategy.pk)
+        self.assertEqual(
+            list(PositionStrategy.objects.filter(user=self.user, is_current=True).values_list('pk', flat=True)),
+            [v4.pk],
+        )
+
+    def test_create_new_version_keeps_unsaved_changes_on_source(self):
+        self.strategy.title = 'Breakout v2'
+        new_version = self.strategy.create_new_version(new_content={}, version_notes='v2')
+
+        self.assertEqual(new_version.title, 'Breakout v2')
+        self.assertFalse(self.strategy.is_current)
+        self.assertEqual(self.strategy.status, 'archived')
+
+    def test_is_latest_version_compares_against_group_max(self):
+        self.assertTrue(self.strategy.is_latest_version)
+        v2 = self.strategy.create_new_version(new_content={}, version_notes='v2')
+
+        self.assertFalse(self.strategy.is_latest_version)
+        self.assertTrue(v2.is_latest_version)
+
+    def test_new_version_demotes_group_in_one_update(self):
+        self.strategy.status = 'draft'
+        self.strategy.save(update_fields=['status'])
+        before = PositionStrategy.objects.get(pk=self.strategy.pk).updated_at
+
+        child = PositionStrategy.objects.create(
+            user=self.user, parent_strategy=self.strategy, title='Breakout', strategy_content={},
+        )
+        parent = PositionStrategy.objects.get(pk=self.strategy.pk)
+
+        self.assertEqual(child.version, 2)
+        self.assertTrue(child.is_current)
+        self.assertFalse(parent.is_current)
+        self.assertGreater(parent.updated_at, before)
+
+    def test_version_history_defers_strategy_content(self):
+        v2 = self.strategy.create_new_version(new_content={}, version_notes='v2')
+
+        history = list(v2.get_version_history())
+
+        self.assertEqual([s.version for s in history], [2, 1])
+        self.assertIn('strategy_content', history[0].get_deferred_fields())
+
+    def test_only_one_current_version_per_group(self):
+        v2 = self.strategy.create_new_version(new_content={}, version_notes='v2')
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            PositionStrategy.objects.filter(pk=self.strategy.pk).update(is_current=True)
+
+        v2.refresh_from_db()
+        self.assertTrue(v2.is_current)
+
+    # SQLite ignore select_for_update : pas de FOR UPDATE dans la requête
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_new_version_locks_group_root(self):
+        with CaptureQueriesContext(connection) as ctx:
+            PositionStrategy.objects.create(
+                user=self.user, parent_strategy=self.strategy, title='Breakout', strategy_content={},
+            )
+        statements = [q['sql'] for q in ctx.captured_queries if not q['sql'].startswith(('SAVEPOINT', 'RELEASE'))]
+        # Verrou sur la racine avant la démotion et la numérotation
+        self.assertIn('FOR UPDATE', statements[0])
+        self.assertTrue(statements[1].startswith('UPDATE'))
+
+    def test_latest_flag_annotation_sees_whole_group(self):
+        v2 = self.strategy.create_new_version(new_content={}, version_notes='v2')
+
+        flags = dict(
+            PositionStrategy.objects.filter(user=self.user).with_latest_flag()
+            .values_list('pk', 'annotated_is_latest_version')
+        )
+        self.assertEqual(flags, {self.strategy.pk: False, v2.pk: True})
+        # Filtrage préalable : l'annotation compare toujours au groupe entier
+        old = PositionStrategy.objects.filter(pk=self.strategy.pk).with_latest_flag().get()
+        self.assertFalse(old.is_latest_version)
+
+    def test_version_count_annotation_matches_serializer_fallback(self):
+        from trades.serializers import PositionStrategySerializer
+
+        v2 = self.strategy.create_new_version(new_content={}, version_notes='v2')
+        v3 = v2.create_new_version(new_content={}, version_notes='v3')
+        other = PositionStrategy.objects.create(user=self.user, title='Range', strategy_content={})
+
+        counts = dict(
+            PositionStrategy.objects.filter(user=self.user).with_latest_flag().with_version_count()
+            .values_list('pk', 'annotated_version_count')
+        )
+        self.assertEqual(counts, {self.strategy.pk: 3, v2.pk: 3, v3.pk: 3, other.pk: 1})
+        # Repli sans annotation (ex. réponse de create_new_version) : même valeur
+        plain = PositionStrategy.objects.get(pk=v3.pk)
+        self.assertEqual(PositionStrategySerializer().get_version_count(plain), 3)
@@ -327,6 +327,18 @@ class TopStepXTradeUpsertTests(TestCase):
         self.assertEqual(result['created'], 0)
         self.assertEqual(result['created_trade_days'], set())
 
+    def test_invalid_rows_counted_and_not_inserted(self) -> None:
+        bad_price = {**self.parsed, 'external_trade_id': 'api-bad-price', 'entry_price': Decimal('0')}
+        bad_size = {**self.parsed, 'external_trade_id': 'api-bad-size', 'size': Decimal('-1')}
+        result = import_parsed_trades(self.user, self.account, [self.parsed, bad_price, bad_size])
+        self.assertEqual(result['created'], 1)
+        self.assertEqual(result['skipped'], 0)
+        self.assertEqual(result['invalid'], 2)
+        self.assertEqual(len(result['errors']), 2)
+        self.assertFalse(
+            ImportedTrade.objects.filter(external_trade_id__in=['api-bad-price', 'api-bad-size']).exists()
+        )
+
     def test_existing_trade_notes_preserved_on_skip(self) -> None:
         trade = ImportedTrade.objects.create(
             user=self.user,
@@ -0,0 +1,52 @@
+"""Lecture des trades : dates formatées en SQL et querysets allégés des listes."""
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.test import TestCase
+
+from accounts.models import User
+from trades.models import ImportedTrade, TradingAccount
+from trades.serializers import ImportedTradeListSerializer
+
+
+class ImportedTradeFormattedDatesTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            email='formatted-dates@example.com',
+            username='formatted_dates',
+            password='testpass123',
+        )
+        self.account = TradingAccount.objects.create(
+            user=self.user, name='Formatted', account_type='other', currency='USD', status='active'
+        )
+        self.trade = ImportedTrade.objects.create(
+            user=self.user,
+            trading_account=self.account,
+            external_trade_id='fmt-1',
+            contract_name='NQZ5',
+            entered_at=datetime(2025, 10, 8, 16, 23, 28, tzinfo=dt_timezone.utc),
+            exited_at=datetime(2025, 10, 8, 16, 31, 3, tzinfo=dt_timezone.utc),
+            entry_price=Decimal('25261.75'),
+            exit_price=Decimal('25245.75'),
+            size=Decimal('3'),
+            trade_type='Long',
+        )
+
+    def test_sql_annotation_matches_python_formatting(self) -> None:
+        annotated = ImportedTrade.objects.with_formatted_dates().get(pk=self.trade.pk)
+        plain = ImportedTrade.objects.get(pk=self.trade.pk)
+        self.assertEqual(annotated.formatted_entry_date, '08/10/2025 16:23:28')
+        self.assertEqual(annotated.formatted_entry_date, plain.formatted_entry_date)
+        self.assertEqual(annotated.formatted_exit_date, plain.formatted_exit_date)
+
+    def test_save_invalidates_annotated_value(self) -> None:
+        annotated = ImportedTrade.objects.with_formatted_dates().get(pk=self.trade.pk)
+        annotated.entered_at = datetime(2025, 10, 9, 9, 0, 0, tzinfo=dt_timezone.utc)
+        annotated.save()
+        self.assertEqual(annotated.formatted_entry_date, '09/10/2025 09:00:00')
+
+    def test_light_list_serialization_does_not_load_deferred_fields(self) -> None:
+        with self.assertNumQueries(1):
+            trades = list(ImportedTrade.objects.filter(user=self.user).with_related().light())
+            data = ImportedTradeListSerializer(trades, many=True).data
+        self.assertEqual(data[0]['external_trade_id'], 'fmt-1')
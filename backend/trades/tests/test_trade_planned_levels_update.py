@@ -68,3 +68,21 @@ class ImportedTradePlannedLevelsUpdateTests(APITestCase):
         self.assertIsNone(response.data['planned_take_profit'])
         self.assertIsNone(response.data['planned_risk_reward_ratio'])
         self.assertIsNone(response.data['actual_risk_reward_ratio'])
+
+    def test_save_with_update_fields_skips_unsaved_derived_fields(self) -> None:
+        self.trade.planned_stop_loss = None
+        self.trade.notes = 'Note seule'
+        self.trade.save(update_fields=['notes'])
+
+        # Le R:R n'est pas sauvegardé : il n'est pas recalculé en mémoire non plus
+        self.assertIsNotNone(self.trade.planned_risk_reward_ratio)
+        self.trade.refresh_from_db()
+        self.assertEqual(self.trade.notes, 'Note seule')
+        self.assertIsNotNone(self.trade.planned_stop_loss)
+        self.assertIsNotNone(self.trade.planned_risk_reward_ratio)
+
+        self.trade.planned_stop_loss = None
+        self.trade.save(update_fields=['planned_stop_loss', 'planned_risk_reward_ratio', 'actual_risk_reward_ratio'])
+        self.trade.refresh_from_db()
+        self.assertIsNone(self.trade.planned_risk_reward_ratio)
+        self.assertIsNone(self.trade.actual_risk_reward_ratio)
@@ -184,3 +184,40 @@ class TradeStrategyDrilldownFiltersTests(TestCase):
         data = self._paginated({'ordering': 'trade_day', 'page_size': '10'})
         ids = [row['trade_info']['external_trade_id'] for row in data['results']]
         self.assertEqual(ids, ['R1', 'R2', 'R3', 'R4'])
+
+    def test_list_query_count_independent_of_page_size(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from rest_framework.test import APIRequestFactory, force_authenticate
+
+        from trades.views import TradeStrategyViewSet
+
+        view = TradeStrategyViewSet.as_view({'get': 'list'})
+        counts = []
+        for page_size in ('1', '1', '10'):  # 1re requête : caches de permission à froid
+            request = APIRequestFactory().get('/api/trades/trade-strategies/', {'page_size': page_size})
+            force_authenticate(request, user=self.user)
+            with CaptureQueriesContext(connection) as ctx:
+                response = view(request)
+                response.render()
+            counts.append(len(ctx.captured_queries))
+        self.assertEqual(counts[1], counts[2])
+        row = response.data['results'][0]
+        self.assertEqual(row['user_username'], 'drill')
+        self.assertEqual(row['trade_info']['size'], '1.0000')
+
+    def test_str_uses_joined_trade(self):
+        strategy = TradeStrategy.objects.with_trade().get(trade__external_trade_id='R1')
+        with self.assertNumQueries(0):
+            self.assertIn('ES', str(strategy))
+            self.assertEqual(strategy.user.username, 'drill')
+
+    def test_light_defers_text_columns_without_extra_queries(self):
+        with self.assertNumQueries(1):
+            rows = list(TradeStrategy.objects.filter(user=self.user).select_related('trade').light())
+            for strategy in rows:
+                strategy.strategy_respected, strategy.dominant_emotions
+                strategy.trade.trade_day, strategy.trade.net_pnl
+        self.assertTrue(rows)
+        self.assertTrue({'emotion_details', 'possible_improvements'} <= rows[0].get_deferred_fields())
+        self.assertTrue({'raw_data', 'notes', 'strategy'} <= rows[0].trade.get_deferred_fields())
@@ -0,0 +1,70 @@
+"""Liste des comptes de trading : trades_count annoté, sans requête par compte."""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import User
+from trades.models import ImportedTrade, TradingAccount
+from trades.views import TradingAccountViewSet
+
+
+class TradingAccountListTradesCountTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            email='account-list@example.com',
+            username='account_list',
+            password='testpass123',
+        )
+        self.account = self._create_account('A')
+        now = timezone.now()
+        for i in range(3):
+            ImportedTrade.objects.create(
+                user=self.user,
+                trading_account=self.account,
+                external_trade_id=f'acc-list-{i}',
+                contract_name='NQ',
+                trade_type='Long',
+                entered_at=now + timedelta(minutes=i),
+                exited_at=now + timedelta(minutes=i + 5),
+                entry_price=Decimal('100'),
+                exit_price=Decimal('101'),
+                size=Decimal('1'),
+                pnl=Decimal('20'),
+            )
+
+    def _create_account(self, name: str, **kwargs) -> TradingAccount:
+        kwargs.setdefault('status', 'active')
+        return TradingAccount.objects.create(
+            user=self.user, name=name, account_type='other', currency='USD', **kwargs
+        )
+
+    def _list(self):
+        view = TradingAccountViewSet.as_view({'get': 'list'})
+        request = APIRequestFactory().get('/api/trades/trading-accounts/')
+        force_authenticate(request, user=self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = view(request)
+            response.render()
+        return response, len(ctx.captured_queries)
+
+    def test_trades_count_annotated_per_account(self) -> None:
+        self._create_account('B')
+        response, _ = self._list()
+        counts = {row['name']: row['trades_count'] for row in response.data}
+        self.assertEqual(counts, {'A': 3, 'B': 0})
+
+    def test_query_count_independent_of_account_count(self) -> None:
+        self._list()  # 1re requête : caches de permission à froid
+        _, few = self._list()
+        for name in ('D', 'C', 'B'):
+            self._create_account(name, copy_imports_from=self.account)
+        self._create_account('E', copy_imports_from=self.account, status='inactive')
+        response, many = self._list()
+        self.assertEqual(few, many)
+        row = next(r for r in response.data if r['name'] == 'A')
+        self.assertEqual([a['name'] for a in row['accounts_copying_this_one']], ['B', 'C', 'D'])
@@ -2,32 +2,13 @@
 Utilitaires pour l'import de trades depuis TopStep.
 """
 import csv
+import io
 from decimal import Decimal
 from django.db import transaction
 from .models import ImportedTrade, TopStepImportLog, TradingAccount
 from .contract_utils.contract_specs import get_point_value_from_contract
 
 
-def _recalculate_mll_for_topstep_accounts(accounts):
-    """Recalcule les métriques MLL pour chaque compte TopStep distinct."""
-    from .services import AccountMetricsCalculator
-
-    calculator = AccountMetricsCalculator()
-    seen_ids = set()
-    for acct in accounts:
-        if not acct or not acct.is_topstep or acct.id in seen_ids:
-            continue
-        seen_ids.add(acct.id)
-        trade_dates = (
-            acct.imported_trades.filter(trade_day__isnull=False)
-            .values_list('trade_day', flat=True)
-            .distinct()
-            .order_by('trade_day')
-        )
-        for trade_date in trade_dates:
-            calculator.calculate_metrics_for_date(acct, trade_date)
-
-
 class TopStepCSVImporter:
     """
     Classe pour importer des fichiers CSV TopStep.
@@ -72,18 +53,22 @@ class TopStepCSVImporter:
         if not self.target_accounts:
             raise ValueError("Aucun compte de trading par défaut trouvé pour cet utilisateur")
 
-    def _row_exists(self, external_trade_id, trading_account):
-        from trades.sync.trade_upsert import trade_exists
-        return trade_exists(self.user, trading_account, external_trade_id)
-
-    def _parse_row(self, row, row_num):
-        """Parse commun CSV → dict pour création / validation."""
+    def _parse_row(self, row, row_num, dates=None):
+        """
+        Parse commun CSV → dict pour création / validation.
+        dates : datetimes déjà parsés en colonne (voir _parse_date_columns) ; repli ligne à ligne sinon.
+        """
+        dates = dates or {}
         external_trade_id = row['Id'].strip()
-        entered_at = ImportedTrade.parse_us_datetime(row['EnteredAt'])
-        exited_at = ImportedTrade.parse_us_datetime(row['ExitedAt']) if row['ExitedAt'].strip() else None
+        entered_at = dates.get('EnteredAt') or ImportedTrade.parse_us_datetime(row['EnteredAt'])
+        exited_at = None
+        if row['ExitedAt'].strip():
+            exited_at = dates.get('ExitedAt') or ImportedTrade.parse_us_datetime(row['ExitedAt'])
 
         trade_day = None
-        if row['TradeDay'].strip():
+        if dates.get('TradeDay'):
+            trade_day = dates['TradeDay'].date()
+        elif row['TradeDay'].strip():
             try:
                 trade_day_dt = ImportedTrade.parse_us_datetime(row['TradeDay'])
                 trade_day = trade_day_dt.date()
@@ -101,6 +86,10 @@ class TopStepCSVImporter:
         trade_type = row['Type'].strip()
         if trade_type not in ['Long', 'Short']:
             raise ValueError(f"Type de trade invalide: {trade_type} (ligne {row_num})")
+        if not entry_price or entry_price <= 0:
+            raise ValueError(f"Prix d'entrée invalide: {row['EntryPrice']} (ligne {row_num})")
+        if not size or size <= 0:
+            raise ValueError(f"Taille invalide: {row['Size']} (ligne {row_num})")
 
         contract_name = row['ContractName'].strip()
         point_value = get_point_value_from_contract(contract_name)
@@ -119,7 +108,6 @@ class TopStepCSVImporter:
             'trade_type': trade_type,
             'contract_name': contract_name,
             'point_value': point_value,
-            'raw_row': dict(row),
         }
 
     def _estimated_pnl(self, parsed):
@@ -138,12 +126,106 @@ class TopStepCSVImporter:
             return price_diff * size
         return Decimal('0')
 
-    def _import_row_for_account(self, parsed, row_num, trading_account):
-        """Crée un trade pour un compte donné. Retourne l'instance ou None si doublon."""
-        from trades.sync.trade_upsert import create_trade_from_parsed
+    DATE_COLUMNS = ('EnteredAt', 'ExitedAt', 'TradeDay')
 
-        payload = {**parsed, 'raw_data': parsed.get('raw_row')}
-        return create_trade_from_parsed(self.user, trading_account, payload)
+    def _parse_date_columns(self, rows):
+        """Parse les colonnes de dates en une passe vectorisée par colonne (None si non reconnue)."""
+        return {
+            column: ImportedTrade.parse_us_datetimes([row.get(column) or '' for row in rows])
+            for column in self.DATE_COLUMNS
+        }
+
+    def _parse_rows(self, rows):
+        """
+        Parse les lignes lues (numérotées comme le fichier : en-tête = 1) et retourne
+        [(row_num, parsed)] pour les lignes valides ; les autres sont comptées dans errors.
+        Les doublons ne sont pas détectés ici mais au moment du dédoublonnage par compte.
+        """
+        column_dates = self._parse_date_columns(rows)
+        parsed_rows = []
+        for index, row in enumerate(rows):
+            row_num = index + 2
+            try:
+                dates = {column: values[index] for column, values in column_dates.items()}
+                parsed_rows.append((row_num, self._parse_row(row, row_num, dates)))
+            except Exception as e:
+                self.error_count += 1
+                self.errors.append({
+                    'row': row_num,
+                    'error': str(e),
+                    'data': row
+                })
+        return parsed_rows
+
+    def _bulk_import_rows(self, reader, filename, csv_content):
+        """
+        Parse toutes les lignes puis crée les trades en masse, compte par compte.
+        Le fichier est archivé dans le log d'import ; chaque trade n'en garde que
+        la référence (source_import, source_line_no) au lieu d'une copie JSON de la ligne.
+        Retourne le nombre de lignes lues ; compteurs et totaux sont mis à jour sur l'instance.
+        """
+        from trades.sync.trade_upsert import bulk_create_trades_from_parsed
+
+        import_log = TopStepImportLog.objects.create(
+            user=self.user,
+            filename=filename,
+            total_rows=0,
+            success_count=0,
+            error_count=0,
+            skipped_count=0,
+            csv_content=csv_content,
+        )
+
+        rows = list(reader)
+        total_rows = len(rows)
+        parsed_rows = []
+        for row_num, parsed in self._parse_rows(rows):
+            # La ligne brute reste relisible dans le CSV archivé (get_row)
+            parsed['source_import'] = import_log
+            parsed['source_line_no'] = row_num
+            parsed_rows.append(parsed)
+
+        for i, acct in enumerate(self.target_accounts):
+            created = bulk_create_trades_from_parsed(self.user, acct, parsed_rows)
+            self.success_count += len(created)
+            self.skipped_count += len(parsed_rows) - len(created)
+            if i == 0:
+                for trade in created:
+                    self.total_pnl += trade.pnl or Decimal('0')
+                    self.total_fees += (trade.fees or Decimal('0')) + (trade.commissions or Decimal('0'))
+
+        import_log.total_rows = total_rows
+        import_log.success_count = self.success_count
+        import_log.error_count = self.error_count
+        import_log.skipped_count = self.skipped_count
+        import_log.errors = self.errors if self.errors else None
+        import_log.save(update_fields=['total_rows', 'success_count', 'error_count', 'skipped_count', 'errors'])
+        return total_rows
+
+    def _dry_run_rows(self, reader):
+        """
+        Prévisualisation sans écriture : mêmes comptages que _bulk_import_rows (dédoublonnage
+        en base par une requête IN par compte, doublons internes au fichier ignorés).
+        Retourne le nombre de lignes lues.
+        """
+        from trades.sync.trade_upsert import existing_external_ids
+
+        rows = list(reader)
+        parsed_rows = [parsed for _, parsed in self._parse_rows(rows)]
+
+        for i, acct in enumerate(self.target_accounts):
+            existing = existing_external_ids(self.user, acct, (p['external_trade_id'] for p in parsed_rows))
+            for parsed in parsed_rows:
+                external_trade_id = parsed['external_trade_id']
+                if external_trade_id in existing:
+                    self.skipped_count += 1
+                    continue
+                existing.add(external_trade_id)
+                self.success_count += 1
+                if i == 0:
+                    self.total_pnl += self._estimated_pnl(parsed)
+                    self.total_fees += parsed['fees'] + parsed['commissions']
+        return len(rows)
 
     def import_from_file(self, file_path, filename=None):
         if filename is None:
@@ -153,8 +235,9 @@ class TopStepCSVImporter:
 
         try:
             self._ensure_targets()
-            with open(file_path, 'r', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
+            with open(file_path, 'r', encoding='utf-8', newline='') as csvfile:
+                csv_content = csvfile.read()
+                reader = csv.DictReader(io.StringIO(csv_content))
 
                 is_valid, missing_columns = self._validate_columns(reader.fieldnames)
                 if not is_valid:
@@ -169,39 +252,7 @@ class TopStepCSVImporter:
                     }
 
                 with transaction.atomic():  # type: ignore
-                    for row_num, row in enumerate(reader, start=2):
-                        total_rows += 1
-                        try:
-                            parsed = self._parse_row(row, row_num)
-                            for acct in self.target_accounts:
-                                trade = self._import_row_for_account(parsed, row_num, acct)
-                                if trade:
-                                    self.success_count += 1
-                                else:
-                                    self.skipped_count += 1
-                        except Exception as e:
-                            error_msg = str(e)
-                            if "déjà importé" in error_msg:
-                                self.skipped_count += 1
-                            else:
-                                self.error_count += 1
-                                self.errors.append({
-                                    'row': row_num,
-                                    'error': error_msg,
-                                    'data': row
-                                })
-
-                    TopStepImportLog.objects.create(
-                        user=self.user,
-                        filename=filename,
-                        total_rows=total_rows,
-                        success_count=self.success_count,
-                        error_count=self.error_count,
-                        skipped_count=self.skipped_count,
-                        errors=self.errors if self.errors else None
-                    )
-
-                    _recalculate_mll_for_topstep_accounts(self.target_accounts)
+                    total_rows = self._bulk_import_rows(reader, filename, csv_content)
 
             return {
                 'success': True,
@@ -229,7 +280,7 @@ class TopStepCSVImporter:
 
         try:
             self._ensure_targets()
-            reader = csv.DictReader(csv_content.splitlines())
+            reader = csv.DictReader(io.StringIO(csv_content))
 
             is_valid, missing_columns = self._validate_columns(reader.fieldnames)
             if not is_valid:
@@ -244,68 +295,10 @@ class TopStepCSVImporter:
                 }
 
             if dry_run:
-                for row_num, row in enumerate(reader, start=2):
-                    total_rows += 1
-                    try:
-                        parsed = self._parse_row(row, row_num)
-                        for i, acct in enumerate(self.target_accounts):
-                            if self._row_exists(parsed['external_trade_id'], acct):
-                                self.skipped_count += 1
-                            else:
-                                self.success_count += 1
-                                if i == 0:
-                                    pnl = self._estimated_pnl(parsed)
-                                    self.total_pnl += pnl
-                                    self.total_fees += parsed['fees'] + parsed['commissions']
-                    except Exception as e:
-                        error_msg = str(e)
-                        if "déjà importé" in error_msg:
-                            self.skipped_count += 1
-                        else:
-                            self.error_count += 1
-                            self.errors.append({
-                                'row': row_num,
-                                'error': error_msg,
-                                'data': row
-                            })
+                total_rows = self._dry_run_rows(reader)
             else:
                 with transaction.atomic():  # type: ignore
-                    for row_num, row in enumerate(reader, start=2):
-                        total_rows += 1
-                        try:
-                            parsed = self._parse_row(row, row_num)
-                            for i, acct in enumerate(self.target_accounts):
-                                trade = self._import_row_for_account(parsed, row_num, acct)
-                                if trade:
-                                    self.success_count += 1
-                                    if i == 0:
-                                        self.total_pnl += trade.pnl or Decimal('0')
-                                        self.total_fees += (trade.fees or Decimal('0')) + (trade.commissions or Decimal('0'))
-                                else:
-                                    self.skipped_count += 1
-                        except Exception as e:
-                            error_msg = str(e)
-                            if "déjà importé" in error_msg:
-                                self.skipped_count += 1
-                            else:
-                                self.error_count += 1
-                                self.errors.append({
-                                    'row': row_num,
-                                    'error': error_msg,
-                                    'data': row
-                                })
-
-                    TopStepImportLog.objects.create(
-                        user=self.user,
-                        filename=filename,
-                        total_rows=total_rows,
-                        success_count=self.success_count,
-                        error_count=self.error_count,
-                        skipped_count=self.skipped_count,
-                        errors=self.errors if self.errors else None
-                    )
-
-                    _recalculate_mll_for_topstep_accounts(self.target_accounts)
+                    total_rows = self._bulk_import_rows(reader, filename, csv_content)
 
             return {
                 'success': True,
@@ -338,25 +331,6 @@ class TopStepCSVImporter:
 
         return True, None
 
-    def _import_row(self, row, row_num):
-        """Compatibilité : import sur le premier compte cible uniquement (tests / ancien code)."""
-        self._ensure_targets()
-        parsed = self._parse_row(row, row_num)
-        return self._import_row_for_account(parsed, row_num, self.target_accounts[0])
-
-    def _validate_row(self, row, row_num):
-        """Valide une ligne (dry_run) pour le compte principal uniquement — compat tests."""
-        self._ensure_targets()
-        parsed = self._parse_row(row, row_num)
-        primary = self.target_accounts[0]
-        if self._row_exists(parsed['external_trade_id'], primary):
-            return {'skip': True}
-        return {
-            'pnl': self._estimated_pnl(parsed),
-            'fees': parsed['fees'],
-            'commissions': parsed['commissions'],
-        }
-
 
 def generate_sample_csv():
     sample = """Id,ContractName,EnteredAt,ExitedAt,EntryPrice,ExitPrice,Fees,PnL,Size,Type,TradeDay,TradeDuration,Commissions
@@ -2,7 +2,7 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action, api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
-from django.db.models import Sum, Count, Avg, Max, Min, F, Value, CharField, Q, Case, When, DecimalField, ExpressionWrapper
+from django.db.models import Sum, Count, Avg, Max, Min, F, Value, CharField, Q, Case, When, DecimalField, ExpressionWrapper, Prefetch
 from django.db.models.functions import TruncDate, Cast, Coalesce
 from django.db import models
 from django.utils import timezone
@@ -48,8 +48,7 @@ def refresh_goals_for_user(user, goal_types):
         goal_type__in=goal_types,
     ).exclude(status='cancelled')
 
-    for goal in goals_qs:
-        goal.update_progress()
+    TradingGoal.bulk_update_progress(goals_qs.select_related('user', 'trading_account'))  # type: ignore
 
 
 def parse_contract_query_params(query_params) -> list[str]:
@@ -191,7 +190,13 @@ class TradingAccountViewSet(PnlPreferenceMixin, viewsets.ModelViewSet):
         
         queryset = TradingAccount.objects.filter(user=self.request.user).select_related(  # type: ignore
             'copy_imports_from',
-        ).prefetch_related('accounts_that_copy_me')
+        ).prefetch_related(
+            Prefetch(
+                'accounts_that_copy_me',
+                queryset=TradingAccount.objects.filter(status='active').order_by('name'),  # type: ignore
+                to_attr='active_copying_accounts',
+            ),
+        )
         
         # Pour les opérations de détail (retrieve, update, delete), inclure les archivés
         # Pour la liste, exclure les archivés sauf si explicitement demandé
@@ -199,6 +204,8 @@ class TradingAccountViewSet(PnlPreferenceMixin, viewsets.ModelViewSet):
             include_archived = self.request.query_params.get('include_archived', 'false').lower() == 'true'
             if not include_archived:
                 queryset = queryset.exclude(status='archived')
+            # trades_count : un COUNT groupé au lieu d'une requête par compte listé
+            queryset = queryset.annotate(annotated_trades_count=Count('imported_trades'))
         
         return queryset
     
@@ -246,12 +253,9 @@ class TradingAccountViewSet(PnlPreferenceMixin, viewsets.ModelViewSet):
         try:
             account = self.get_object()
             
-            # Désactiver tous les autres comptes par défaut
-            self.get_queryset().exclude(pk=account.pk).update(is_default=False)
-            
-            # Activer ce compte comme défaut
-            account.is_default = True
-            account.save()
+            # Désactiver les autres comptes par défaut et activer celui-ci (deux UPDATE)
+            TradingAccount.bulk_set_default(request.user, account.pk)
+            account.refresh_from_db(fields=['is_default'])
             
             serializer = self.get_serializer(account)
             return Response(serializer.data)
@@ -585,7 +589,8 @@ class AccountTransactionViewSet(viewsets.ModelViewSet):
         """Retourne uniquement les transactions de l'utilisateur connecté."""
         return (
             self._filtered_account_transactions(apply_transaction_type=True)
-            .select_related('trading_account', 'user')
+            .with_account()
+            .select_related('user')
             .order_by('-transaction_date', '-created_at')
         )
 
@@ -685,8 +690,7 @@ class AccountTransactionViewSet(viewsets.ModelViewSet):
                 Q(trading_account__isnull=True) | Q(trading_account_id=trading_account_id)
             )
 
-        for goal in goals_qs:
-            goal.update_progress()
+        TradingGoal.bulk_update_progress(goals_qs.select_related('user', 'trading_account'))  # type: ignore
     
     @action(detail=False, methods=['get'])
     def balance(self, request):
@@ -829,9 +833,14 @@ class ImportedTradeViewSet(PnlPreferenceMixin, viewsets.ModelViewSet):
         queryset = (
             ImportedTrade.objects
             .filter(user=self.request.user)  # type: ignore
-            .select_related('trading_account', 'user', 'position_strategy')
+            .with_related()
             .order_by('-entered_at')
         )
+        if self.action in ('retrieve', 'update', 'partial_update'):
+            # Le serializer détaillé expose les dates formatées : calculées en SQL
+            queryset = queryset.with_formatted_dates()
+        elif self.action == 'list':
+            queryset = queryset.light()
         
         # Filtre par compte de trading (uniquement si fourni)
         trading_account_id = self.request.query_params.get('trading_account', None)
@@ -1500,7 +1509,7 @@ class ImportedTradeViewSet(PnlPreferenceMixin, viewsets.ModelViewSet):
         month_strategies = TradeStrategy.objects.filter(
             user=request.user,
             trade__in=month_trades
-        ).select_related('trade')
+        ).select_related('trade').light()
         
         # Récupérer les compliances pour les jours sans trades de ce mois
         month_compliances = DayStrategyCompliance.objects.filter(  # type: ignore
@@ -2226,7 +2235,7 @@ class TopStepImportLogViewSet(viewsets.ReadOnlyModelViewSet):
         """Retourne uniquement les logs de l'utilisateur connecté."""
         if not self.request.user.is_authenticated:
             return TopStepImportLog.objects.none()  # type: ignore
-        return TopStepImportLog.objects.filter(user=self.request.user).order_by('-imported_at')  # type: ignore
+        return TopStepImportLog.objects.filter(user=self.request.user).defer('csv_content').order_by('-imported_at')  # type: ignore
 
 
 class TradeStrategyViewSet(PnlPreferenceMixin, viewsets.ModelViewSet):
@@ -2243,14 +2252,20 @@ class TradeStrategyViewSet(PnlPreferenceMixin, viewsets.ModelViewSet):
             return TradeStrategy.objects.none()  # type: ignore
         
         # Optimisation des requêtes DB avec select_related/prefetch_related
+        # only() doit couvrir tous les champs du serializer (user, dominant_emotions, urls, trade.size) :
+        # un champ différé coûte une requête par ligne.
         queryset = TradeStrategy.objects.filter(user=self.request.user)\
-            .select_related('trade', 'trade__trading_account')\
+            .with_trade()\
+            .select_related('trade__trading_account')\
             .only(
                 'id', 'strategy_respected', 'tp1_reached', 'tp2_plus_reached',
                 'session_rating', 'created_at', 'updated_at', 'emotion_details',
                 'possible_improvements', 'gain_if_strategy_respected',
+                'dominant_emotions', 'screenshot_url', 'video_url',
+                'user__id', 'user__username',
                 'trade__id', 'trade__external_trade_id', 'trade__contract_name', 'trade__trade_type',
-                'trade__pnl', 'trade__net_pnl', 'trade__entered_at', 'trade__exited_at', 'trade__trade_day',
+                'trade__size', 'trade__pnl', 'trade__net_pnl', 'trade__entered_at', 'trade__exited_at',
+                'trade__trade_day',
                 'trade__trading_account__id', 'trade__trading_account__name',
                 'trade__trading_account__currency',
             )  # type: ignore
@@ -2386,7 +2401,7 @@ class TradeStrategyViewSet(PnlPreferenceMixin, viewsets.ModelViewSet):
             strategies = TradeStrategy.objects.filter(  # type: ignore
                 user=self.request.user,  # ✅ Filtre par utilisateur
                 trade__trade_day=date
-            ).select_related('trade', 'trade__trading_account')
+            ).with_trade()
             
             # Filtrer par compte de trading si spécifié
             trading_account_id = request.query_params.get('trading_account')
@@ -2424,7 +2439,7 @@ class TradeStrategyViewSet(PnlPreferenceMixin, viewsets.ModelViewSet):
                 user=self.request.user,
                 trade__trade_day__gte=start_date.strftime('%Y-%m-%d'),
                 trade__trade_day__lt=end_date.strftime('%Y-%m-%d')
-            ).select_related('trade')
+            ).select_related('trade').light()
             
             # Agréger par date
             data_by_date = {}
@@ -3782,11 +3797,8 @@ class PositionStrategyViewSet(viewsets.ModelViewSet):
         queryset = PositionStrategy.objects.filter(user=self.request.user)\
             .select_related('user', 'parent_strategy')  # type: ignore
         
-        # Optimisation: Annoter avec version_count pour éviter les requêtes supplémentaires
-        # Compter les versions enfants + 1 pour inclure la stratégie elle-même
-        queryset = queryset.annotate(
-            annotated_version_count=models.Count('versions', distinct=True) + 1
-        )
+        # Optimisation: version_count calculé en SQL sur le groupe de versions (racine + enfants)
+        queryset = queryset.with_version_count()
         
         # Optimisation: Annoter parent_created_at pour éviter N+1 queries dans get_created_at()
         # Si parent_strategy existe, utiliser sa created_at, sinon utiliser la sienne
@@ -3798,6 +3810,9 @@ class PositionStrategyViewSet(viewsets.ModelViewSet):
             )
         )
         
+        # Optimisation: is_latest_version calculé en SQL (sinon une requête par stratégie sérialisée)
+        queryset = queryset.with_latest_flag()
+        
         # Filtres optionnels
         status = self.request.query_params.get('status', None)
         is_current = self.request.query_params.get('is_current', None)
@@ -4340,6 +4355,10 @@ class TradingGoalViewSet(viewsets.ModelViewSet):
         if trading_account:
             queryset = queryset.filter(trading_account_id=trading_account)
         
+        if self.action == 'list':
+            # Progression calculée en SQL et noms utilisateur / compte joints pour la liste
+            queryset = queryset.with_progress().with_account().select_related('user')
+        
         return queryset.order_by('-priority', '-created_at')
     
     def perform_create(self, serializer):
@@ -4381,12 +4400,8 @@ class TradingGoalViewSet(viewsets.ModelViewSet):
         """
         Met à jour la progression de tous les objectifs actifs de l'utilisateur.
         """
-        active_goals = self.get_queryset().filter(status='active')
-        updated_count = 0
-        
-        for goal in active_goals:
-            goal.update_progress()
-            updated_count += 1
+        active_goals = self.get_queryset().filter(status='active').select_related('user', 'trading_account')
+        updated_count = TradingGoal.bulk_update_progress(active_goals)  # type: ignore
         
         return Response({
             'message': f'{updated_count} objectif(s) mis à jour',
@@ -481,7 +481,7 @@ class WithdrawalSuggestionsView(APIView):
         ).filter(Q(user_id=request.user.id) | Q(trading_account__user_id=request.user.id))
         if used_tx_ids:
             qs = qs.exclude(pk__in=used_tx_ids)
-        qs = qs.distinct().select_related('trading_account').order_by('-transaction_date')[:200]
+        qs = qs.distinct().with_account().order_by('-transaction_date')[:200]
         data = [
             {
                 'id': tx.id,